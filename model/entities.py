@@ -11,87 +11,136 @@ Controls (AZERTY):
 import pygame
 import random
 import os
-from collections import defaultdict
-from abc import ABC,abstractmethod
+from collections import Counter
+from itertools import accumulate
+
+# méthodes liées du générateur global : évitent la résolution random.xxx à chaque tirage
+# (random.seed agit toujours sur ce même générateur)
+_random = random.random
+_choice = random.choice
+_choices = random.choices
+
+# Game state containers
+DIRS = {'up':(-1,0), 'down':(1,0), 'left':(0,-1), 'right':(0,1)}
+OPP  = {'up':'down','down':'up','left':'right','right':'left'}
+DIR_ORDER = ['up', 'right', 'down', 'left']
+
+# ports encodés sur 4 bits dans l'ordre horaire de DIR_ORDER :
+# tourner une pièce d'un quart de tour = décaler le masque d'un bit (circulairement)
+DIR_BIT = {d: 1 << i for i, d in enumerate(DIR_ORDER)}
+OPP_BIT = {d: DIR_BIT[OPP[d]] for d in DIR_ORDER}
+# index d'une direction dans les tables à 4 cases (DIR_DR, Cell.doors, ...)
+DIR_IDX = {d: i for i, d in enumerate(DIR_ORDER)}
+# mêmes directions codées par leur index : déplacement et index opposé
+DIR_DR = tuple(DIRS[d][0] for d in DIR_ORDER)
+DIR_DC = tuple(DIRS[d][1] for d in DIR_ORDER)
+DIR_OPP = tuple(DIR_IDX[OPP[d]] for d in DIR_ORDER)
+
+# portes d'une case tassées dans un entier (Cell.doors) : 2 bits par direction,
+# au décalage 2*DIR_IDX[d], valant niveau de verrou + 1 (0 = pas de porte)
+def door_level(doors, i):
+    """Niveau de verrou (0/1/2) de la porte d'indice `i`, ou None s'il n'y en a pas."""
+    v = (doors >> 2*i) & 3
+    return v - 1 if v else None
+
+def with_door(doors, i, level):
+    """Renvoie `doors` où la porte d'indice `i` a le niveau de verrou `level`."""
+    return (doors & ~(3 << 2*i)) | ((level + 1) << 2*i)
+
+def ports_mask(ports_dict):
+    """Convertit un dict de ports {'up': bool, ...} en masque de bits."""
+    mask = 0
+    for d, bit in DIR_BIT.items():
+        if ports_dict.get(d, False):
+            mask |= bit
+    return mask
+
+def rotated_mask(mask, quarter_turns):
+    """
+    quarter_turns = 0,1,2,3 (0°, 90°, 180°, 270° dans le sens horaire).
+    Retourne le masque de ports tourné (rotation circulaire sur 4 bits).
+    """
+    quarter_turns = quarter_turns % 4
+    return ((mask << quarter_turns) | (mask >> (4 - quarter_turns))) & 0xF
+
+# tables partagées par masque de ports (16 configurations possibles) :
+# ROT_MASKS[m] = masques des 4 rotations de m, ROT_BITS[m] = ces masques en ensemble de bits
+ROT_MASKS = tuple(tuple(rotated_mask(m, rot) for rot in range(4)) for m in range(16))
+ROT_BITS = tuple(sum(1 << r for r in set(rots)) for rots in ROT_MASKS)
+# ROT_DISTINCT[m] = couples (rotation, masque) sans doublon, première rotation gardée :
+# une pièce symétrique (couloir, carrefour) n'a qu'une ou deux rotations à tester
+ROT_DISTINCT = tuple(tuple((rots.index(mr), mr) for mr in dict.fromkeys(rots))
+                     for rots in ROT_MASKS)
+# PORT_FLAGS[m] = portes de m en tuple figé (haut, droite, bas, gauche) ; immuable,
+# donc partagé sans risque entre les pièces de même configuration
+PORT_FLAGS = tuple(tuple(bool(m & DIR_BIT[d]) for d in DIR_ORDER) for m in range(16))
 
 class Piece:
+    # pas de __dict__ par instance : attributs publics stockés dans des slots,
+    # lus directement (sans propriété) dans les boucles de légalité et de tirage
+    __slots__ = ('nom', 'image_id', 'cout', 'degre_rarete', 'ports', 'port_mask',
+                 'rot_masks', 'rot_bits', 'rot_distinct', 'couleur', 'obj', 'proba', 'cond_deplac',
+                 'zones_autorisees')
+
     def __init__(self, nom, ports, cout, degre_rarete, zones_autorisees, couleur, obj, image_id=None):
         # attributs de base
-        self.__nom = nom
-        self.__image_id = image_id
-        self.__cout = cout
-        self.__degre_rarete = degre_rarete
-        self.__ports = ports
-        self.__couleur = couleur
-        self.__obj = obj
-
-        # IMPORTANT : toujours définir __cond_deplac pour éviter l'AttributeError
-        self.__cond_deplac = None
+        self.nom = nom
+        self.image_id = image_id
+        self.cout = cout
+        self.degre_rarete = degre_rarete
+        mask = self.port_mask = ports_mask(ports)
+        self.ports = PORT_FLAGS[mask]   # dans l'ordre de DIR_ORDER (voir DIR_IDX)
+        # masques des 4 rotations, indexés par le nombre de quarts de tour
+        self.rot_masks = ROT_MASKS[mask]
+        # même information en ensemble de bits sur 16 positions (bit m ⇔ masque m atteignable),
+        # à croiser avec Game._fitting_masks en un seul ET
+        self.rot_bits = ROT_BITS[mask]
+        # rotations donnant des masques différents (voir ROT_DISTINCT)
+        self.rot_distinct = ROT_DISTINCT[mask]
+        self.couleur = couleur
+        self.obj = obj
+        # poids de tirage : la rareté ne change jamais, on le calcule une fois
+        self.proba = 1 / (3 ** degre_rarete)
+
+        # IMPORTANT : toujours définir cond_deplac pour éviter l'AttributeError
+        self.cond_deplac = None
         # zones_autorisees peut être :
         # - une liste/ensemble de zones -> on le garde comme zones_autorisees
         # - une string ('edge', 'corner', 'center', etc.) -> on la traite comme cond_deplac
         if isinstance(zones_autorisees, str):
             # ici on utilise la string comme contrainte de déplacement
-            self.__cond_deplac = zones_autorisees
-            self.__zones_autorisees = None
+            self.cond_deplac = zones_autorisees
+            self.zones_autorisees = None
         elif zones_autorisees:
             # liste / set / tuple de zones
-            self.__zones_autorisees = set(zones_autorisees)
+            self.zones_autorisees = set(zones_autorisees)
         else:
-            self.__zones_autorisees = None
-
-    # propriétés
-    @property
-    def zones_autorisees(self):
-        return self.__zones_autorisees
-
-    @property
-    def nom(self):
-        return self.__nom
-
-    @property
-    def cout(self):
-        return self.__cout
-
-    @property
-    def ports(self):
-        return self.__ports
-
-    @property
-    def degre_rarete(self):
-        return self.__degre_rarete
-
-    @property
-    def couleur(self):
-        return self.__couleur
-
-    @property
-    def image_id(self):
-        return self.__image_id
-
-    @property
-    def cond_deplac(self):
-        # si jamais on a oublié de le définir, on renvoie None plutôt qu'une erreur
-        return self.__cond_deplac
-
-    @property
-    def obj(self):
-        return self.__obj
+            self.zones_autorisees = None
 
     # méthode
     def proba_tirage(self):
         """Pour calculer la probabilité de tirer une pièce suivant sa rareté."""
-        return 1 / (3 ** self.__degre_rarete)
+        return self.proba
 
 class Inventory:
+    __slots__ = ('objets_consommables', 'objets_permanents', 'version', '_vue_conso', '_vue_perm')
+
     def __init__(self):
-        self.objets_consommables = { "pas" : 70, "pieces" : 0, "gemmes" : 2, "cles" : 0, "des" : 0}
+        # Counter : un consommable inconnu vaut 0 (sans être inséré à la lecture),
+        # pas de test d'existence avant un +=
+        self.objets_consommables = Counter({ "pas" : 70, "pieces" : 0, "gemmes" : 2, "cles" : 0, "des" : 0})
         self.objets_permanents = {
             "pelle" : False,
             "marteau" : False,
             "kit_de_crochetage" : False,
             "detecteur_de_metaux" : False,
             "patte_de_lapin" : False}
+        # incrémenté à chaque modification : comparer deux versions suffit à savoir
+        # si l'inventaire a changé (le rendu s'en sert pour ses caches)
+        self.version = 0
+        # listes (nom, valeur, libellé) pour l'affichage, reconstruites après modification
+        self._vue_conso = None
+        self._vue_perm = None
 
     #methodes
     #objets consommables
@@ -108,10 +157,27 @@ class Inventory:
         Returns:
             None
         """   
-        if nom_objet in self.objets_consommables:
-            self.objets_consommables[nom_objet] += quantitee
-        else:
-            self.objets_consommables[nom_objet] = quantitee
+        self.objets_consommables[nom_objet] += quantitee
+        self._vue_conso = None
+        self.version += 1
+
+    def ajouter_lot(self, lot):
+        """Ajoute plusieurs consommables d'un coup (ex. un butin).
+
+        Équivaut à appeler `ajouter_conso` pour chaque entrée, mais l'inventaire
+        n'est marqué modifié qu'une fois.
+
+        Args:
+            lot: Itérable de couples (nom du consommable, quantité).
+
+        Returns:
+            None
+        """
+        conso = self.objets_consommables
+        for nom_objet, quantitee in lot:
+            conso[nom_objet] += quantitee
+        self._vue_conso = None
+        self.version += 1
 
     def retirer(self, nom_objet, quantitee):
         """Retire une quantité d'un consommable s'il y a assez de stock.
@@ -126,8 +192,10 @@ class Inventory:
                 bool: True si le retrait a été effectué ; False sinon (stock insuffisant
                 ou consommable inexistant).
         """
-        if self.objets_consommables.get(nom_objet, 0) >= quantitee:
+        if self.objets_consommables[nom_objet] >= quantitee:
             self.objets_consommables[nom_objet] -= quantitee
+            self._vue_conso = None
+            self.version += 1
             return True
         return False
 
@@ -145,21 +213,48 @@ class Inventory:
             None
         """  
         self.objets_permanents[nom_objet] = True
+        self._vue_perm = None
+        self.version += 1
 
-LOOT_TABLE_CHEST=[
+    #affichage
+    def vue_consommables(self):
+        """Retourne les consommables sous forme de tuple de (nom, quantité, libellé).
+
+        Le tuple est mis en cache et reconstruit seulement après une modification.
+        """
+        if self._vue_conso is None:
+            self._vue_conso = tuple((k, v, f"{k} : {v}") for k, v in self.objets_consommables.items())
+        return self._vue_conso
+
+    def vue_permanents(self):
+        """Retourne les objets permanents sous forme de tuple de (nom, possédé)."""
+        if self._vue_perm is None:
+            self._vue_perm = tuple(self.objets_permanents.items())
+        return self._vue_perm
+
+def _loot_table(*rows):
+    """Range une table de butin en colonnes : (noms, quantités, probabilités,
+    probabilités avec détecteur de métaux)."""
+    names, amounts, probs = zip(*rows)
+    # +15% pour les clés et les pièces avec le détecteur, sans dépasser 100%
+    probs_detector = tuple(min(1.0, p + 0.15) if name in ("cles", "pieces") else p
+                           for name, p in zip(names, probs))
+    return names, amounts, probs, probs_detector
+
+LOOT_TABLE_CHEST=_loot_table(
     ("gemmes",1,0.35),
     ("cles",1,0.40),
     ("pieces",15,0.50),
-]
-LOOT_TABLE_CASIER=[
+)
+LOOT_TABLE_CASIER=_loot_table(
     ("cles",1,0.60),
     ('pieces',10,0.30),
-]
-LOOT_TABLE_DIG=[
+)
+LOOT_TABLE_DIG=_loot_table(
     ("pieces",8,0.50),
     ("cles",1,0.20),
     ("gemmes",1,0.20),
-]
+)
 # --- Shop items (always available in any shop room) ---
 SHOP_ITEMS = [
     {   "code": "cles",
@@ -181,133 +276,102 @@ SHOP_ITEMS = [
         "amount": 10,},
 ]
 
+# lot de consolation quand aucun tirage ne tombe
+LOOT_CONSOLATION = ('pieces', 5)
+
 def _roll_loot(table,has_detector=False):
     "Returns a list of (resource, amount) according to independent probabilities. If nothing falls, gives consolation coins" 
-    out=[]
-    for name,amt,p in table:
-        if has_detector and name in ("cles", "pieces"):
-            eff_p = min(1.0, p + 0.15)   # +15% but with more than 100%
-        else:
-            eff_p = p
-
-        if random.random()<eff_p:
-            out.append((name,amt))
-    if not out:
-            out=[('pieces',5)]
-    return out   
-
-class Interactable(ABC):
-    """Classe abstraite représentant un élément interactif dans le manoir.
-
-        Cette classe définit l’interface commune pour tous les objets avec lesquels
-        le joueur peut interagir (coffres, casiers, sites de fouille, etc.).  
-        Chaque sous-classe doit préciser un `label`, un symbole visuel (`emoji`)
-        et la logique de l’interaction (`interact`).
+    names, amounts, probs, probs_detector = table
+    if has_detector:
+        probs = probs_detector
+    out=[(name, amt) for name, amt, p in zip(names, amounts, probs) if _random()<p]
+    return out or [LOOT_CONSOLATION]
+
+# description de chaque type d'interactif, clé = valeur 'spawn' des effets on_enter.
+# 'consumable' est dépensé en priorité ; sinon 'permanent' suffit (sans être consommé).
+INTERACTABLE_KINDS = {
+    'chest': {
+        'label': "a chest",
+        'emoji': "🧰",
+        'consumable': "cles",
+        'permanent': "marteau",
+        'loot': LOOT_TABLE_CHEST,
+        'msg_empty': "The chest is empty.",
+        'msg_missing': "A chest is here. You need a key or the hammer.",
+        'msg_consumable': "Used a key to open the chest.",
+        'msg_permanent': "Used the hammer to smash the chest.",
+    },
+    'casier': {
+        'label': "a locker",
+        'emoji': "🔒",
+        'consumable': "cles",
+        'permanent': None,
+        'loot': LOOT_TABLE_CASIER,
+        'msg_empty': "The locker is empty.",
+        'msg_missing': "A locker is here. You need a key.",
+        'msg_consumable': "Locker opened",
+        'msg_permanent': None,
+    },
+    'dig_site': {
+        'label': "a dig site",
+        'emoji': "⛏️",
+        'consumable': None,
+        'permanent': "pelle",
+        'loot': LOOT_TABLE_DIG,
+        'msg_empty': "Nothing left to dig here.",
+        'msg_missing': "You found a dig site. You need a shovel.",
+        'msg_consumable': None,
+        'msg_permanent': "You dug the site",
+    },
+}
+
+class Interactable:
+    """Élément interactif du manoir (coffre, casier, site de fouille).
+
+        Le comportement est entièrement décrit par une entrée de
+        `INTERACTABLE_KINDS` (objet requis, table de butin, messages) ;
+        une instance ne stocke que cette description et son état.
 
         Attributs:
+            kind (dict): Description du type, partagée entre les instances.
             opened (bool): Indique si l’objet a déjà été ouvert/utilisé.
                         Par défaut à False.
-
-        Méthodes abstraites:
-            label() -> str:
-                Retourne le nom descriptif de l’objet (ex. "un coffre").
-            emoji() -> str:
-                Retourne un caractère ou emoji représentant visuellement l’objet.
-            interact(game, cell):
-                Définit le comportement lorsque le joueur interagit avec l’objet.
-                Doit être implémentée par les sous-classes.
         """
-    def __init__(self):
-        self.opened=False
-    @abstractmethod
-    def label(self)-> str:
-        pass
-    @abstractmethod
-    def emoji(self)-> str:
-        pass
-    @abstractmethod
-    def interact(self,game,cell):
-        pass
-
-class Chest(Interactable):
-    def label(self) -> str:
-        return "a chest"
-
-    def emoji(self) -> str:
-        return "🧰"
-
-    def interact(self, game, cell):
-        if self.opened:
-            game.turn_msg = "The chest is empty."
-            return
-        # cle ou marteau
-        if game.inventory.objets_consommables.get("cles", 0) > 0:
-            game.inventory.retirer("cles", 1)
-            msg = "Used a key to open the chest."
-        elif game.inventory.objets_permanents.get("marteau"):
-            msg = "Used the hammer to smash the chest."
-        else:
-            game.turn_msg = "A chest is here. You need a key or the hammer."
-            return
-        
-        has_detector = game.inventory.objets_permanents.get("detecteur_de_metaux", False)
-        loot = _roll_loot(LOOT_TABLE_CHEST,has_detector=has_detector)
-        self.opened = True
-        game.turn_msg = msg
-        for name, amt in loot:
-            game.inventory.ajouter_conso(name, amt)
-            game.turn_msg += f" → +{amt} {name}"
+    __slots__ = ('kind', 'opened')
 
+    def __init__(self, kind):
+        self.kind = kind
+        self.opened = False
 
-class Casier(Interactable):
     def label(self) -> str:
-        return "a locker"
+        return self.kind['label']
 
     def emoji(self) -> str:
-        return "🔒"
+        return self.kind['emoji']
 
     def interact(self, game, cell):
+        kind = self.kind
         if self.opened:
-            game.turn_msg = "The locker is empty."
+            game.turn_msg = kind['msg_empty']
             return
-        # just key
-        if game.inventory.objets_consommables.get("cles", 0) > 0:
-            game.inventory.retirer("cles", 1)
+        inv = game.inventory
+        consumable = kind['consumable']
+        permanent = kind['permanent']
+        if consumable and inv.objets_consommables[consumable] > 0:
+            inv.retirer(consumable, 1)
+            msg = kind['msg_consumable']
+        elif permanent and inv.objets_permanents.get(permanent):
+            msg = kind['msg_permanent']
         else:
-            game.turn_msg = "A locker is here. You need a key."
+            game.turn_msg = kind['msg_missing']
             return
-        
-        has_detector = game.inventory.objets_permanents.get("detecteur_de_metaux", False)
-        loot = _roll_loot(LOOT_TABLE_CASIER,has_detector=has_detector)
-        self.opened = True
-        game.turn_msg = "Locker opened"
-        for name, amt in loot:
-            game.inventory.ajouter_conso(name, amt)
-            game.turn_msg += f" → +{amt} {name}"
-
-
-class DigSite(Interactable):
-    def label(self) -> str:
-        return "a dig site"
-
-    def emoji(self) -> str:
-        return "⛏️"
 
-    def interact(self, game, cell):
-        if self.opened:
-            game.turn_msg = "Nothing left to dig here."
-            return
-        if not game.inventory.objets_permanents.get("pelle"):
-            game.turn_msg = "You found a dig site. You need a shovel."
-            return
-        
-        has_detector = game.inventory.objets_permanents.get("detecteur_de_metaux", False)
-        loot = _roll_loot(LOOT_TABLE_DIG,has_detector=has_detector)
+        has_detector = inv.objets_permanents.get("detecteur_de_metaux", False)
+        loot = _roll_loot(kind['loot'], has_detector=has_detector)
         self.opened = True
-        game.turn_msg = "You dug the site"
-        for name, amt in loot:
-            game.inventory.ajouter_conso(name, amt)
-            game.turn_msg += f" → +{amt} {name}"
+        inv.ajouter_lot(loot)
+        game.turn_msg = msg + "".join(f" → +{amt} {name}" for name, amt in loot)
+
 # -------------------------
 # Game-specific code
 # -------------------------
@@ -327,14 +391,47 @@ pygame.init()
 FONT = pygame.font.SysFont("Arial", 16)
 BIG = pygame.font.SysFont("Arial", 22, bold=True)
 
+# images déjà chargées et mises à l'échelle, clé (chemin, taille) ; l'image
+# d'origine décodée est gardée sous la clé (chemin, None) pour ne lire le
+# fichier qu'une fois quelle que soit la taille demandée.
+# Un échec de chargement est mémorisé aussi (None) pour ne pas retoucher le disque.
+# Chargement paresseux : une image n'est lue qu'au premier rendu qui en a besoin.
+_IMG_CACHE = {}
+
+def _load_master(path):
+    key = (path, None)
+    if key not in _IMG_CACHE:
+        try:
+            im = pygame.image.load(path).convert_alpha()
+        except Exception:
+            im = None
+        _IMG_CACHE[key] = im
+    return _IMG_CACHE[key]
+
+def _load_scaled(path, size):
+    key = (path, size)
+    if key in _IMG_CACHE:
+        return _IMG_CACHE[key]
+    im = _load_master(path)
+    if im is not None:
+        im = pygame.transform.smoothscale(im, size)
+    _IMG_CACHE[key] = im
+    return im
+
 def load_image(name, size=(CELL_W, CELL_H)):
+    return _load_scaled(os.path.join(IMAGES_FOLDER, name), tuple(size))
+
+def load_image_rotated(name, rotation, size=(CELL_W, CELL_H)):
+    """Image de pièce tournée de `rotation` quarts de tour (sens horaire), mise en cache."""
     path = os.path.join(IMAGES_FOLDER, name)
-    try:
-        im = pygame.image.load(path).convert_alpha()
-        im = pygame.transform.smoothscale(im, size)
-        return im
-    except Exception:
-        return None
+    key = (path, tuple(size), 'rot', rotation % 4)
+    if key not in _IMG_CACHE:
+        img = load_image(name, size)
+        if img and rotation % 4:
+            # rotation en degrés dans le sens horaire -> Pygame tourne dans le sens anti-horaire
+            img = pygame.transform.rotate(img, -90 * (rotation % 4))
+        _IMG_CACHE[key] = img
+    return _IMG_CACHE[key]
 
 # Basic room catalog (small set for the demo). Each entry is a Piece instance.
 # ports = dict indicating which sides have doors relative to piece center (up/down/left/right)
@@ -755,56 +852,122 @@ ROOM_CATALOG.extend([
 
 ])
 
+# le catalogue est figé une fois construit : les Piece sont partagées entre parties
+ROOM_CATALOG = tuple(ROOM_CATALOG)
+
 # multiplicity in initial deck (you can change)
-INITIAL_DECK = []
+# add multiple instances for balance: more commons than rares
+# RARITY_MULT[rareté] pour une rareté 0..3 (au-delà : comme 3)
+RARITY_MULT = (7, 5, 3, 1)
+# pioche initiale en multiensemble {pièce: nombre d'exemplaires}, copiée par chaque Game
+# (Entrance Hall n'est pas dans la pioche : elle ne sert que pour la 1ere case)
+INITIAL_DECK_COUNT = Counter({p: RARITY_MULT[min(max(p.degre_rarete, 0), 3)]
+                              for p in ROOM_CATALOG if p.nom != "Entrance Hall"})
+
+# index du catalogue par nom et par couleur (listes dans l'ordre du catalogue)
+ROOMS_BY_NAME = {}
+ROOMS_BY_COLOR = {}
 for p in ROOM_CATALOG:
-    if p.nom == "Entrance Hall":
-        continue  # on ne le met pas dans la pioche: que pour la 1ere
-    # add multiple instances for balance: more commons than rares
-    mult = 1 if p.degre_rarete>=3 else 3 if p.degre_rarete==2 else 5 if p.degre_rarete==1 else 7
-    for _ in range(mult):
-        INITIAL_DECK.append(p)
-
-def weighted_sample_no_replacement(pool, k):
-    """Select k distinct elements from pool using weight = p.proba_tirage()"""
-    pool = list(pool)
-    selected = []
-    available = pool[:]
-    for _ in range(min(k, len(pool))):
-        weights = [x.proba_tirage() for x in available]
-        tot = sum(weights)
-        if tot==0:
-            choice = random.choice(available)
-        else:
-            r = random.random()*tot
-            cum=0
-            for i,w in enumerate(weights):
-                cum += w
-                if r<=cum:
-                    choice = available[i]
-                    break
-        selected.append(choice)
-        available.remove(choice)
-    return selected
+    ROOMS_BY_NAME.setdefault(p.nom, []).append(p)
+    ROOMS_BY_COLOR.setdefault(p.couleur, []).append(p)
 
-# Game state containers
-DIRS = {'up':(-1,0), 'down':(1,0), 'left':(0,-1), 'right':(0,1)}
-OPP  = {'up':'down','down':'up','left':'right','right':'left'}
-DIR_ORDER = ['up', 'right', 'down', 'left']
+# pièces ajoutées à la pioche par les effets on_draw (Veranda, Furnace)
+GREEN_ROOMS = tuple(ROOMS_BY_COLOR.get('green', ()))
+FURNACE_ROOMS = tuple(ROOMS_BY_NAME.get('Furnace', ()))
 
-def rotated_ports(ports_dict, quarter_turns):
-    """
-    quarter_turns = 0,1,2,3 (0°, 90°, 180°, 270° dans le sens horaire).
-    Retourne un nouveau dict ports tourné.
+def weighted_sample_no_replacement(pool, k, counts=None):
+    """Select k distinct elements from pool using weight = p.proba_tirage()
+
+    Tirage pondéré sans remise par rejet : `random.choices` (bisection en C
+    sur les poids cumulés) tire les éléments manquants, les doublons sont
+    rejetés. Même loi que k tirages successifs sans remise.
+    Les poids cumulés sont calculés une fois ; ils ne sont refaits, sans les
+    éléments déjà tirés, qu'après un doublon (sinon, avec k proche de
+    len(pool), une pièce lourde déjà tirée ferait boucler les relances).
+
+    Si `counts` (ex. la pioche Counter) est fourni, le poids d'une pièce est
+    multiplié par son nombre d'exemplaires.
     """
-    quarter_turns = quarter_turns % 4
-    new_ports = {}
-    for i, d in enumerate(DIR_ORDER):
-        has_port = ports_dict.get(d, False)
-        # nouvelle direction après rotation
-        new_dir = DIR_ORDER[(i + quarter_turns) % 4]
-        new_ports[new_dir] = has_port
-    return new_ports
+    k = min(k, len(pool))
+    if k <= 0:
+        return []
+    if counts is None:
+        weights = [x.proba for x in pool]
+    else:
+        weights = [x.proba * counts[x] for x in pool]
+    cum_weights = list(accumulate(weights))
+    picks = []
+    seen = set()
+    while True:
+        for c in _choices(pool, cum_weights=cum_weights, k=k - len(picks)):
+            if c not in seen:
+                seen.add(c)
+                picks.append(c)
+        if len(picks) >= k:
+            return picks
+        # doublon : on relance sur les éléments restants uniquement
+        rest = [(x, w) for x, w in zip(pool, weights) if x not in seen]
+        pool = [x for x, _ in rest]
+        weights = [w for _, w in rest]
+        cum_weights = list(accumulate(weights))
+
+def _lock_thresholds(target_row):
+    """Seuils cumulés (p0, p0+p1) du niveau de verrou pour une ligne."""
+    # linear mapping: bottom row -> 0, top row -> 2
+    if ROWS <= 1 or target_row == ROWS-1:
+        return (1.0, 1.0)  #first row always 0
+    if target_row == 0:
+        return (0.0, 0.0)  #last row always 2
+    #distance from 'grown', 0 in bottom, 1 on top
+    t = (ROWS-1 - target_row) / (ROWS-1)
+    p2 = 0.1+0.7*t
+    p0 = 0.7-0.6*t
+    p1 = max(0.0, 1.0-p0-p2)
+    return (p0, p0+p1)
+
+LOCK_THRESHOLDS = tuple(_lock_thresholds(r) for r in range(ROWS))
+
+# ALLOWED_PORTS[r][c] : masque des directions qui restent dans le plateau depuis (r, c)
+ALLOWED_PORTS = [
+    [sum(DIR_BIT[d] for d, (dr, dc) in DIRS.items() if 0 <= r+dr < ROWS and 0 <= c+dc < COLS)
+     for c in range(COLS)]
+    for r in range(ROWS)
+]
+# BOUNDARY_MASK[r*COLS+c] : complément, directions qui sortent du plateau depuis (r, c)
+BOUNDARY_MASK = tuple(0xF & ~ALLOWED_PORTS[r][c] for r in range(ROWS) for c in range(COLS))
+
+def _blocked_conds(r, c):
+    """Contraintes de placement (cond_deplac) que la case (r, c) ne satisfait pas."""
+    on_edge = r in (0, ROWS-1) or c in (0, COLS-1)
+    in_corner = r in (0, ROWS-1) and c in (0, COLS-1)
+    in_center = 0 < r < ROWS-1 and 0 < c < COLS-1
+    return frozenset(cond for cond, ok in (('edge', on_edge), ('corner', in_corner),
+                                           ('center', in_center)) if not ok)
+
+# BLOCKED_CONDS[r][c] : valeurs de cond_deplac refusées sur la case (r, c)
+# (None ou toute autre valeur → pas de contrainte)
+BLOCKED_CONDS = [[_blocked_conds(r, c) for c in range(COLS)] for r in range(ROWS)]
+
+def _fitting_bits(opp, outside, occ, req):
+    """Ensemble (bit m) des masques de ports m compatibles avec une case :
+    port vers l'origine `opp`, aucun port dans `outside`, et (m & occ) == req."""
+    bits = 0
+    for m in range(16):
+        if m & opp and not m & outside and (m & occ) == req:
+            bits |= 1 << m
+    return bits
+
+# résultats de _fitting_bits, clé (opp, outside, occ, req) : au plus 4*16*16*16 entrées,
+# partagés par toutes les parties (ne dépendent que des masques)
+_FITTING_CACHE = {}
+
+# NEIGHBORS[i] : voisins de la case d'index plat i = r*COLS+c,
+# sous forme de triplets (bit de la direction, bit opposé, index plat du voisin)
+NEIGHBORS = tuple(
+    tuple((DIR_BIT[d], OPP_BIT[d], (r+dr)*COLS + c+dc)
+          for d, (dr, dc) in DIRS.items() if 0 <= r+dr < ROWS and 0 <= c+dc < COLS)
+    for r in range(ROWS) for c in range(COLS)
+)
 
 class Cell:
     """Représente une case du plateau de jeu.
@@ -815,24 +978,35 @@ class Cell:
 
     Attributs:
         piece (Piece | None): La pièce placée sur cette case, ou None si vide.
-        doors (dict[str, int | None]): Dictionnaire des portes adjacentes,
-            associant chaque direction ('up','down','left','right') à un niveau
-            de verrou :
+        doors (int): Portes adjacentes, 2 bits par direction dans l'ordre de
+            DIR_ORDER (lus avec door_level, écrits avec with_door), donnant
+            le niveau de verrou :
                 - 0 : porte ouverte
                 - 1 : verrou faible
                 - 2 : verrou fort
-                - None : pas de porte
+                - None : pas de porte (0 si la case n'a aucune porte)
         interactable (Interactable | None): Objet interactif présent sur la case,
             ou None s’il n’y en a pas.
+        port_mask (int): Ports (voir DIR_BIT) de la pièce posée, rotation comprise ; 0 si vide.
+        nbr_occ (int): Directions dans lesquelles une pièce voisine est déjà posée.
+        nbr_req (int): Parmi ces directions, celles où le voisin a une porte vers cette case.
     """  
+    __slots__ = ('piece', 'rotation', 'port_mask', 'nbr_occ', 'nbr_req', 'doors', 'interactable',
+                 'steps_bonus_used', 'coins_collected', 'food_eaten')
+
     def __init__(self):
         self.piece = None
         self.rotation = 0   # 0,1,2,3 → 0°, 90°, 180°, 270°
-        self.doors = {'up':None,'down':None,'left':None,'right':None}
+        # masques tenus à jour par Game.place_piece
+        self.port_mask = 0
+        self.nbr_occ = 0
+        self.nbr_req = 0
+        self.doors = 0   # aucune porte (voir door_level / with_door)
         self.interactable=None
         #flags poru des effets uniques
         self.steps_bonus_used = False
         self.coins_collected = False
+        self.food_eaten = False
 
 
 class Game:
@@ -843,9 +1017,9 @@ class Game:
         site de fouille). Elle maintient tout l’état nécessaire au rendu Pygame.
     
     Attributs:
-        deck (list[Piece]): Pioche courante (copies superficielles des pièces définies dans le catalogue), mélangée au démarrage.
+        deck (Counter[Piece, int]): Pioche courante, multiensemble associant chaque pièce du catalogue à son nombre d'exemplaires restants.
 
-        grid (list[list[Cell]]): Grille de cellules (ROWS x COLS) contenant éventuellement une `Piece`, des portes et un interactif.
+        grid (list[Cell]): Grille de cellules (ROWS x COLS) stockée à plat, la case (r, c) étant à l'index r*COLS+c ; chaque cellule contient éventuellement une `Piece`, des portes et un interactif.
 
         player_r (int): Ligne actuelle du joueur dans la grille.
 
@@ -863,19 +1037,37 @@ class Game:
 
         target_cell (tuple[int,int] | None): Coordonnées (r,c) de la cellule ciblée lors d’un placement, sinon None.
 
+        target_dir (str | None): Direction du joueur vers `target_cell` lors d’un placement, sinon None.
+
         running (bool): Indique si la partie est en cours (pour terminer proprement la boucle de jeu).
+
+        dirty (bool): True si l’écran doit être redessiné (mis à True par chaque action du joueur).
+
+        state_dirty (bool): True si l’état de jeu a pu changer (déplacement, placement, relance,
+            interaction, achat) : game_loop ne refait le test de fin de partie que dans ce cas.
+
+        grid_surface (pygame.Surface | None): Rendu du plateau mis en cache entre deux images (créé au premier rendu).
+
+        dirty_cells (set[tuple[int,int]]): Cases à repeindre sur `grid_surface` au prochain rendu.
+
+        dirty_all (bool): True si tout le plateau doit être repeint (premier rendu).
     
     """    
     def __init__(self):
-        self.deck = INITIAL_DECK[:]  # shallow copies of Piece references; removing an element prevents further draws
-        random.shuffle(self.deck)
-        # grid of cells
-        self.grid = [[Cell() for _ in range(COLS)] for __ in range(ROWS)]
+        # copie du multiensemble initial ; retirer le dernier exemplaire empêche de nouveaux tirages
+        self.deck = INITIAL_DECK_COUNT.copy()
+        # grid of cells, à plat : (r, c) -> index r*COLS+c (voisins via NEIGHBORS)
+        self.grid = [Cell() for _ in range(ROWS*COLS)]
+        # versions incrémentées à chaque modification de la pioche / du plateau
+        # (place_piece incrémente _grid_version, d'où leur création avant l'entrée) ;
+        # elles servent de clés aux caches de légalité plus bas
+        self._deck_version = 0
+        self._grid_version = 0
         # place entrance at bottom middle
         start_r = ROWS-1
         start_c = COLS//2
-        entrance_piece = next((p for p in ROOM_CATALOG if p.nom=="Entrance Hall"), None)
-        self.grid[start_r][start_c].piece = entrance_piece
+        entrance_piece = ROOMS_BY_NAME.get("Entrance Hall", [None])[0]
+        self.place_piece(start_r, start_c, entrance_piece, 0)
         self.player_r = start_r
         self.player_c = start_c
         # mark the entrance cell doors initialization (all doors default None)
@@ -885,10 +1077,40 @@ class Game:
         self.candidates = []
         self.selection_pos = 0
         self.target_cell = None
+        self.target_dir = None
         self.running = True
         self.in_shop=False
         self.shop_active=False 
         self.shop_index=0
+        self._legal_moves_key = None
+        self._legal_moves_value = False
+        self._reach_key = None
+        self._reach = (0, 0)
+        # pièces légales par (case, direction), valables pour un couple de versions
+        self._legal_pools = {}
+        self._legal_pools_versions = None
+        # rendu du plateau mis en cache : seules les cases modifiées sont repeintes
+        self.grid_surface = None
+        self.dirty_cells = set()
+        self.dirty_all = True
+        # fond du panneau latéral, construit au premier rendu
+        self._panel_bg = None
+        # section « Consumables » du panneau, recomposée quand l'inventaire change
+        self._conso_surf = None
+        self._conso_version = -1
+        # section « Permanents », même mécanisme
+        self._perm_surf = None
+        self._perm_version = -1
+        # rendu du message de tour, refait seulement quand turn_msg change
+        self._msg_text = None
+        self._msg_surf = None
+        # True quand l'état affiché a changé : game_loop ne redessine que dans ce cas
+        self.dirty = True
+        self.state_dirty = True
+
+    def mark_dirty(self, r, c):
+        """Signale que la case (r, c) doit être redessinée au prochain rendu."""
+        self.dirty_cells.add((r, c))
 
     def in_bounds(self, r,c):
         """Vérifie si des coordonnées sont dans les limites de la grille.
@@ -902,14 +1124,34 @@ class Game:
         """    
         return 0<=r<ROWS and 0<=c<COLS
     
+    def place_piece(self, r, c, piece, rotation):
+        """Pose `piece` en (r, c) et met à jour les masques de voisinage des cases adjacentes.
+
+        Seul point de modification du plateau : incrémente `_grid_version`, ce qui
+        invalide les caches de légalité (pool de candidats, coups légaux).
+        """
+        self._grid_version += 1
+        idx = r*COLS + c
+        cells = self.grid
+        cell = cells[idx]
+        cell.piece = piece
+        cell.rotation = rotation
+        if piece is None:
+            cell.port_mask = 0
+            return
+        ports = cell.port_mask = piece.rot_masks[rotation]
+        for bit, opp, nidx in NEIGHBORS[idx]:
+            neigh = cells[nidx]
+            neigh.nbr_occ |= opp
+            if ports & bit:
+                neigh.nbr_req |= opp
+
     def cell_ports(self, r, c):
-        cell = self.grid[r][c]
-        if not cell.piece:
-            return {'up':False,'down':False,'left':False,'right':False}
-        return rotated_ports(cell.piece.ports, cell.rotation)
+        """Masque des ports (voir DIR_BIT) de la pièce posée en (r, c), 0 si vide."""
+        return self.grid[r*COLS + c].port_mask
     
     def piece_ports_with_rotation(self, piece, rotation):
-        return rotated_ports(piece.ports, rotation)
+        return piece.rot_masks[rotation % 4]
     
     def fits_board_and_direction(self, piece, tr, tc, direction):
         """
@@ -920,19 +1162,10 @@ class Game:
 
         C'est le filtre demandé dans l'énoncé (ports & bords).
         """
-        # contrainte 'edge' : la pièce ne peut aller qu'en bord si cond_deplac == 'edge'
-        cond = piece.cond_deplac
-        on_edge = (tr == 0 or tr == ROWS-1 or tc == 0 or tc == COLS-1)
-        in_corner = (tr in (0, ROWS-1) and tc in (0, COLS-1))
-        in_center = (0 < tr < ROWS-1 and 0 < tc < COLS-1)
-
-        if cond == 'edge' and not on_edge:
-            return False
-        if cond == 'corner' and not in_corner:
-            return False
-        if cond == 'center' and not in_center:
+        # contraintes 'edge' / 'corner' / 'center' : table précalculée par case
+        # (si cond == None ou 'any' → pas de contrainte)
+        if piece.cond_deplac in BLOCKED_CONDS[tr][tc]:
             return False
-        # si cond == None ou 'any' → pas de contrainte
 
         # le reste (ports / voisins) est déjà géré
         return self.can_place_piece(piece, tr, tc, direction)
@@ -941,87 +1174,114 @@ class Game:
         """
         Génère jusqu'à 3 pièces candidates pour la case (tr, tc) en venant
         de 'direction', en respectant :
-            - fits_board_and_direction (ports + bords)
+            - les règles de fits_board_and_direction (ports + bords), appliquées
+              à toute la pioche d'un coup : contrainte de position (BLOCKED_CONDS)
+              puis un ET entre rot_bits et les masques acceptables de la case
             - filtre par gemmes
             - robustesse : au moins 1 choix coût 0 si possible
 
         Retourne une liste de 1 à 3 pièces. Liste vide si aucune pièce légale.
         """
         # 1) toutes les pièces LEGALISABLES sur cette case
-        legal_pool = []
-        for p in self.deck:
-            if self.fits_board_and_direction(p, tr, tc, direction):
-                legal_pool.append(p)
+        #    (une seule fois par pièce distincte de la pioche) ; les listes sont
+        #    gardées par case tant que la pioche et le plateau sont inchangés
+        #    (ex. relance des candidats avec un dé, retour sur une case déjà tentée)
+        versions = (self._deck_version, self._grid_version)
+        if versions != self._legal_pools_versions:
+            self._legal_pools_versions = versions
+            self._legal_pools.clear()
+        key = (tr, tc, direction)
+        legal_pool = self._legal_pools.get(key)
+        if legal_pool is None:
+            # les pièces dont la contrainte de position exclut la case sont écartées
+            # avant tout test de ports
+            # puis un seul ET par pièce contre les masques acceptables de la case
+            blocked = BLOCKED_CONDS[tr][tc]
+            fitting = self._fitting_masks(tr, tc, direction)
+            legal_pool = self._legal_pools[key] = [
+                p for p in self.deck
+                if p.rot_bits & fitting and p.cond_deplac not in blocked]
 
         if not legal_pool:
             return []
 
         # 2) filtre par gemmes (comme dans ton code original),
         #    mais on ne perd jamais les pièces de coût 0
-        gems = self.inventory.objets_consommables.get('gemmes', 0)
-        pool = [p for p in legal_pool if p.cout == 0 or p.cout <= gems]
+        #    en une seule passe, qui range aussi à part les pièces de coût 0 (étape 3)
+        gems = self.inventory.objets_consommables['gemmes']
+        pool = []
+        zero_cost_rooms = []
+        for p in legal_pool:
+            if p.cout == 0:
+                pool.append(p)
+                zero_cost_rooms.append(p)
+            elif p.cout <= gems:
+                pool.append(p)
 
         # si après filtre on n'a plus rien (pas assez de gemmes et pas de pièces à 0),
-        # on tombe en secours sur toutes les pièces légales
+        # on tombe en secours sur toutes les pièces légales (jamais modifiées ensuite)
         if not pool:
-            pool = legal_pool[:]  # fallback, en théorie rare si le deck est bien conçu
+            pool = legal_pool  # fallback, en théorie rare si le deck est bien conçu
 
         # 3) robustesse : au moins 1 choix coût 0 si possible
-        zero_cost_rooms = [p for p in pool if p.cout == 0]
 
         candidates = []
         if zero_cost_rooms:
-            # on force UNE pièce à coût 0
-            free_choice = random.choice(zero_cost_rooms)
+            # on force UNE pièce à coût 0 (au prorata des exemplaires en pioche)
+            free_choice = _choices(zero_cost_rooms,
+                                   weights=[self.deck[p] for p in zero_cost_rooms])[0]
             candidates.append(free_choice)
 
             # puis jusqu'à 2 autres distinctes
             remaining_pool = [p for p in pool if p is not free_choice]
-            others = weighted_sample_no_replacement(remaining_pool, 2)
+            others = weighted_sample_no_replacement(remaining_pool, 2, self.deck)
             candidates.extend(others)
         else:
             # il n'existe aucune pièce coût 0 légale -> on prend juste 3 parmi le pool
-            candidates = weighted_sample_no_replacement(pool, 3)
+            candidates = weighted_sample_no_replacement(pool, 3, self.deck)
 
         return candidates[:3]
 
 
     def can_place_with_ports(self, ports, tr, tc, from_dir):
+        """`ports` est un masque de bits (voir DIR_BIT)."""
         # 1) la pièce doit avoir un port vers l'origine
-        if not ports.get(OPP[from_dir], False):
+        if not ports & OPP_BIT[from_dir]:
             return False
 
         # 2) aucun port ne doit sortir du plateau
-        for d, (dr, dc) in DIRS.items():
-            if ports.get(d, False):
-                nr, nc = tr + dr, tc + dc
-                if not self.in_bounds(nr, nc):
-                    return False
-
-        # 3) compatibilité avec les voisins déjà posés
-        for d, (dr, dc) in DIRS.items():
-            nr, nc = tr + dr, tc + dc
-            if self.in_bounds(nr, nc):
-                neigh_cell = self.grid[nr][nc]
-                neigh_piece = neigh_cell.piece
-                if neigh_piece is not None:
-                    neigh_ports = self.cell_ports(nr, nc)
-                    if ports.get(d, False) and not neigh_ports.get(OPP[d], False):
-                        return False
-                    if neigh_ports.get(OPP[d], False) and not ports.get(d, False):
-                        return False
-        return True
+        idx = tr*COLS + tc
+        if ports & BOUNDARY_MASK[idx]:
+            return False
+
+        # 3) compatibilité avec les voisins déjà posés :
+        #    une porte de chaque côté, ou aucune (masques tenus par place_piece)
+        cell = self.grid[idx]
+        return (ports & cell.nbr_occ) == cell.nbr_req
     
     def can_place_piece(self, piece, tr, tc, from_dir):
         """
         Retourne True si au moins une rotation permet de placer la pièce.
         (la rotation exacte sera choisie ailleurs)
         """
-        for rot in range(4):
-            ports = self.piece_ports_with_rotation(piece, rot)
-            if self.can_place_with_ports(ports, tr, tc, from_dir):
-                return True
-        return False
+        # une rotation convient ssi son masque fait partie des masques acceptables
+        return bool(piece.rot_bits & self._fitting_masks(tr, tc, from_dir))
+
+    def _fitting_masks(self, tr, tc, from_dir):
+        """Masques de ports acceptables en (tr, tc) en venant de `from_dir`.
+
+        Les 16 masques possibles sont testés (mêmes règles que
+        can_place_with_ports, voir `_fitting_bits`, résultat mis en cache) ;
+        le résultat est un ensemble de bits où le bit m vaut 1 si le masque m convient. Une pièce peut être posée si et
+        seulement si `piece.rot_bits & _fitting_masks(...)` est non nul.
+        """
+        idx = tr*COLS + tc
+        cell = self.grid[idx]
+        key = (OPP_BIT[from_dir], BOUNDARY_MASK[idx], cell.nbr_occ, cell.nbr_req)
+        bits = _FITTING_CACHE.get(key)
+        if bits is None:
+            bits = _FITTING_CACHE[key] = _fitting_bits(*key)
+        return bits
 
 
     def neighbor_target(self, direction):
@@ -1033,12 +1293,8 @@ class Game:
             Returns:
                 Un tuple (r, c) des coordonnées de la case voisine.
         """
-        dr,dc = 0,0
-        if direction=='up': dr=-1
-        if direction=='down': dr=1
-        if direction=='left': dc=-1
-        if direction=='right': dc=1
-        return self.player_r+dr, self.player_c+dc
+        i = DIR_IDX[direction]
+        return self.player_r+DIR_DR[i], self.player_c+DIR_DC[i]
 
     def door_lock_for_target_row(self, target_row):
         """Calcule un niveau de verrou (0/1/2) selon la ligne cible.
@@ -1052,26 +1308,11 @@ class Game:
             int: 0 (déverrouillée), 1 (verrou faible), ou 2 (verrou fort).
         
         """
-        # linear mapping: bottom row -> 0, top row -> 2
-        if ROWS <=1:
-            return 0
-        #distance from 'grown', 0 in bottom, 1 on top
-        t = (ROWS-1 - target_row) / (ROWS-1) 
-        if target_row==ROWS-1:
-            return 0 #first row always 0
-        if target_row==0:
-            return 2 #last row always 0
-        p2=0.1+0.7*t
-        p0=0.7-0.6*t
-        p1=max(0.0,1.0-p0-p2)
-        r=random.random()
-        if r<p0:
-            return 0
-        elif r<p0+p1:
-            return 1
-        else:
-            return 2
-        
+        # seuils cumulés précalculés par ligne (LOCK_THRESHOLDS) :
+        # niveau = nombre de seuils dépassés par le tirage
+        t0, t1 = LOCK_THRESHOLDS[target_row]
+        r = _random()
+        return (r >= t0) + (r >= t1)
 
     def open_door_or_move(self, direction):
         """Ouvre une porte et se déplace, ou lance la sélection d’une nouvelle salle.
@@ -1080,28 +1321,30 @@ class Game:
         l’inventaire (clé/kit) puis consomme un pas et entre dans la salle.
         Sinon, passe en mode sélection et propose des pièces valides à placer.
         """
-        tr, tc = self.neighbor_target(direction)
-        if not self.in_bounds(tr, tc):
+        self.dirty = True
+        self.state_dirty = True
+        # direction traduite une fois en index (voir DIR_IDX), réutilisé pour les portes
+        i = DIR_IDX[direction]
+        tr, tc = self.player_r + DIR_DR[i], self.player_c + DIR_DC[i]
+        if not (0 <= tr < ROWS and 0 <= tc < COLS):
             self.turn_msg = "A wall. Can't go there."
             return
 
-        cell = self.grid[tr][tc]
+        cell = self.grid[tr*COLS + tc]
 
         # --- CASE 1 : la case a déjà une pièce -> déplacement ---
         if cell.piece is not None:
-            cur_cell = self.grid[self.player_r][self.player_c]
+            cur_cell = self.grid[self.player_r*COLS + self.player_c]
 
             #vérifier qu'il y a bien une porte entre les deux salles
-            cur_ports = self.cell_ports(self.player_r, self.player_c)
-            tgt_ports = self.cell_ports(tr, tc)
-            if not (cur_ports.get(direction, False) and
-                    tgt_ports.get(self.opposite(direction), False)):
+            if not (cur_cell.port_mask & DIR_BIT[direction] and
+                    cell.port_mask & OPP_BIT[direction]):
                 # pas de porte → pas de déplacement possible
                 self.turn_msg = "No door in that direction."
                 return
 
             #lire le verrou du point de vue de la salle actuelle
-            lock = cur_cell.doors.get(direction)
+            lock = door_level(cur_cell.doors, i)
             if lock is None:
                 lock = 0
 
@@ -1114,7 +1357,7 @@ class Game:
                     opened = True
 
                 # Sinon, essayer une clé
-                elif self.inventory.objets_consommables.get("cles", 0) > 0:
+                elif self.inventory.objets_consommables["cles"] > 0:
                     # Niveau 1 ou 2 : la clé marche toujours
                     self.inventory.retirer("cles", 1)
 
@@ -1135,8 +1378,10 @@ class Game:
 
                 # Si la porte s'est ouverte : on met à 0 des deux côtés
                 if opened:
-                    cur_cell.doors[direction] = 0
-                    cell.doors[self.opposite(direction)] = 0
+                    cur_cell.doors = with_door(cur_cell.doors, i, 0)
+                    cell.doors = with_door(cell.doors, DIR_OPP[i], 0)
+                    self.mark_dirty(self.player_r, self.player_c)
+                    self.mark_dirty(tr, tc)
 
             #déplacer le joueur (coût 1 pas)
             if self.inventory.objets_consommables["pas"] <= 0:
@@ -1151,13 +1396,8 @@ class Game:
 
         # --- CASE 2 : la case est vide -> mode sélection ---
         else:
-            # direction réelle par rapport au joueur (sécurité)
-            dr = tr - self.player_r
-            dc = tc - self.player_c
-            dir_map = {(-1, 0): 'up', (1, 0): 'down', (0, -1): 'left', (0, 1): 'right'}
-            real_dir = dir_map.get((dr, dc), direction)
-
-            candidates = self.generate_candidates(tr, tc, real_dir)
+            # (tr, tc) vient d'être calculé à partir de `direction` : c'est la direction réelle
+            candidates = self.generate_candidates(tr, tc, direction)
             if not candidates:
                 self.turn_msg = "No legal rooms can be placed here."
                 return
@@ -1166,6 +1406,7 @@ class Game:
             self.candidates = candidates
             self.selection_pos = 0
             self.target_cell = (tr, tc)
+            self.target_dir = direction
             self.turn_msg = "Choose a room (ENTER) or press R to redraw (spend a die)."
             return
 
@@ -1177,8 +1418,10 @@ class Game:
             Returns:
                 None
         """
+        self.dirty = True
+        self.state_dirty = True
         
-        cell = self.grid[self.player_r][self.player_c]
+        cell = self.grid[self.player_r*COLS + self.player_c]
 
         # Si la salle est une shop, E sert à ouvrir/fermer le menu
         if cell.piece and cell.piece.obj.get('on_enter', {}).get('type') == 'shop':
@@ -1198,11 +1441,12 @@ class Game:
             return
         
         it = cell.interactable
-        if not isinstance(it, Interactable):
+        if it is None:
             self.turn_msg = "Nothing to interact with."
             return
         
         it.interact(self, cell)
+        self.mark_dirty(self.player_r, self.player_c)
 
     def opposite(self, direction):
         """Donne la direction opposée à celle fournie.
@@ -1213,7 +1457,7 @@ class Game:
         Returns:
             La direction opposée ('down','up','right' ou 'left').
         """
-        return {'up':'down','down':'up','left':'right','right':'left'}[direction]
+        return OPP[direction]
 
     def on_enter(self, cell):
         """Applique les effets d’entrée d’une salle et événements aléatoires.
@@ -1233,128 +1477,106 @@ class Game:
         self.in_shop=False #par defaut on n'est pas dans une shop
         self.shop_active=False
         effects = p.obj.get('on_enter') if p.obj else None
-        if effects:
-            t = effects.get('type')
-            if t == 'coins':
-                amt = effects.get('amount', 0)
-
-                if cell.coins_collected:
-                    #on reprend pas les pièces à chaque passage
-                    self.turn_msg = f"Entered {p.nom}."
-                else:
-                    self.inventory.ajouter_conso('pieces', amt)
-                    self.turn_msg = f"Found {amt} coins!"
-                    cell.coins_collected = True
-
-            elif t == 'food':
-                amt = effects.get('amount', 0)
-
-                # bonus de nourriture appliqué une seule fois par salle
-                already_eaten = getattr(cell, "food_eaten", False)
-                if already_eaten:
-                    # on ne redonne pas de pas si on revient
-                    self.turn_msg = f"Entered {p.nom}."
-                else:
-                    self.inventory.ajouter_conso('pas', amt)
-                    self.turn_msg = f"Ate food and regains {amt} steps!"
-                    cell.food_eaten = True
-
-                #bonus appliqué une seule fois par salle
-                already_used = getattr(cell, "steps_bonus_used", False)
-                if already_used:
-                    #pas de bonus supplémentaire si on revient dans la même room
-                    self.turn_msg = f"Entered {p.nom}."
-                else:
-                    # On compense aussi le coût de déplacement (-1 pas)
-                    # pour que le gain net soit bien de `amt` pas.
-                    self.inventory.ajouter_conso('pas', amt + 1)
-                    self.turn_msg = f"You feel rested and gain {amt} extra steps."
-                    cell.steps_bonus_used = True
-            elif t == 'goal':
-                self.turn_msg = "You reached the Antechamber! You win!"
-                self.running = False
-            elif t == 'start':
-                self.turn_msg = "Back at the Entrance."
-            elif t == 'spawn':
-                what = effects.get('spawn')
-                if isinstance(cell.interactable, Interactable) and not cell.interactable.opened:                    
-                    return
-                if what == 'chest':
-                    cell.interactable = Chest()
-                elif what == 'casier':
-                    cell.interactable = Casier()
-                elif what == 'dig_site':
-                    cell.interactable = DigSite()
-            
-                if cell.interactable:
-                    self.turn_msg = f"You found {cell.interactable.label()}! Press E to interact."
-            elif t=='detecteur_de_metaux':
-                self.inventory.ajouter_perm('detecteur_de_metaux')
-                self.turn_msg='You found a metal detector! Keys and coins will be easier to find.'
-            elif t=='kit_de_crochetage':
-                if not self.inventory.objets_permanents.get('kit_de_crochetage',False):
-                    self.inventory.ajouter_perm('kit_de_crochetage')
-                    self.turn_msg='You found a kit de crochetage! Level-1 doors can be opened for free.'
-                else:
-                    self.turn_msg='You already have a kit de crochetage.'
-            
-            elif t=='pelle':
-                if not self.inventory.objets_permanents.get('pelle',False):
-                    self.inventory.ajouter_perm('pelle')
-                    self.turn_msg='You found a shovel! You can now dig at dig sites.'
-                else:
-                    self.turn_msg='You already have a shovel.'
-            elif t=='marteau':
-                if not self.inventory.objets_permanents.get('marteau',False):
-                    self.inventory.ajouter_perm('marteau')
-                    self.turn_msg='You found a hammer! You can now break chests.'
-                else:
-                    self.turn_msg='You already have a hammer.'
-
-            elif t=='shop':
-                self.turn_msg='You entered the shop. Press E to trade.'
-                self.in_shop=True
-                self.shop_active=False
-                self.shop_index=0
-
-            else:
-                self.turn_msg = f"Entered {p.nom}."
-        else:
-             # Salle sans effet spécial
+        handler = ON_ENTER_HANDLERS.get(effects.get('type')) if effects else None
+        if handler is None:
+            # Salle sans effet spécial (ou effet inconnu)
             self.turn_msg = f"Entered {p.nom}."
+        elif handler(self, cell, effects):
+            return
 
         # possibility to find gems or items randomly
         # if detecteur_de_metaux increases keys/coins chance; patte_de_lapin increases chance to find items
         # patte_de_lapin : augmente la probabilité de trouver quelque chose
         # detecteur_de_metaux : biaise vers cles / pieces
-        base_find = random.random()
+        base_find = _random()
         lapin_bonus = 0.05 if self.inventory.objets_permanents.get('patte_de_lapin') else 0.0
         if base_find < 0.08 + lapin_bonus:
             has_detector = self.inventory.objets_permanents.get('detecteur_de_metaux', False)
-            if has_detector:
-                # higher probability of finding keys and pieces
-                pool = ['gemmes', 'cles', 'cles', 'pieces', 'pieces', 'des', 'pas']
-            else:
-                pool = ['gemmes','cles','des','pieces','pas']
-            found = random.choice(pool)
-            if found=='gemmes':
-                self.inventory.ajouter_conso('gemmes',1)
-                self.turn_msg += " Found 1 gem."
-            elif found=='cles':
-                self.inventory.ajouter_conso('cles',1)
-                self.turn_msg += " Found 1 key."
-            elif found=='des':
-                self.inventory.ajouter_conso('des',1)
-                self.turn_msg += " Found 1 die."
-            elif found=='pieces':
-                self.inventory.ajouter_conso('pieces',5)
-                self.turn_msg += " Found some coins."
-            elif found=='pas':
-                self.inventory.ajouter_conso('pas',3)
-                self.turn_msg += " Found 3 steps."
+            # le détecteur double les entrées clés / pièces (voir FIND_POOL_DETECTOR)
+            pool = FIND_POOL_DETECTOR if has_detector else FIND_POOL
+            name, amount, msg = _choice(pool)
+            self.inventory.ajouter_conso(name, amount)
+            self.turn_msg += msg
+
+    # --- effets 'on_enter', un handler par type (voir ON_ENTER_HANDLERS) ---
+    # Chaque handler reçoit (cell, effects) ; renvoyer True saute les trouvailles aléatoires.
+
+    def _on_enter_coins(self, cell, effects):
+        amt = effects.get('amount', 0)
+        if cell.coins_collected:
+            #on reprend pas les pièces à chaque passage
+            self.turn_msg = f"Entered {cell.piece.nom}."
+        else:
+            self.inventory.ajouter_conso('pieces', amt)
+            self.turn_msg = f"Found {amt} coins!"
+            cell.coins_collected = True
+
+    def _on_enter_food(self, cell, effects):
+        amt = effects.get('amount', 0)
+
+        # bonus de nourriture appliqué une seule fois par salle
+        if cell.food_eaten:
+            # on ne redonne pas de pas si on revient
+            self.turn_msg = f"Entered {cell.piece.nom}."
+        else:
+            self.inventory.ajouter_conso('pas', amt)
+            self.turn_msg = f"Ate food and regains {amt} steps!"
+            cell.food_eaten = True
+
+        #bonus appliqué une seule fois par salle
+        if cell.steps_bonus_used:
+            #pas de bonus supplémentaire si on revient dans la même room
+            self.turn_msg = f"Entered {cell.piece.nom}."
+        else:
+            # On compense aussi le coût de déplacement (-1 pas)
+            # pour que le gain net soit bien de `amt` pas.
+            self.inventory.ajouter_conso('pas', amt + 1)
+            self.turn_msg = f"You feel rested and gain {amt} extra steps."
+            cell.steps_bonus_used = True
+
+    def _on_enter_goal(self, cell, effects):
+        self.turn_msg = "You reached the Antechamber! You win!"
+        self.running = False
+
+    def _on_enter_start(self, cell, effects):
+        self.turn_msg = "Back at the Entrance."
+
+    def _on_enter_spawn(self, cell, effects):
+        it = cell.interactable
+        if it is not None and not it.opened:
+            return True
+        kind = INTERACTABLE_KINDS.get(effects.get('spawn'))
+        if kind is not None:
+            cell.interactable = Interactable(kind)
+
+        if cell.interactable:
+            self.mark_dirty(self.player_r, self.player_c)
+            self.turn_msg = f"You found {cell.interactable.label()}! Press E to interact."
+
+    def _on_enter_detector(self, cell, effects):
+        self.inventory.ajouter_perm('detecteur_de_metaux')
+        self.turn_msg='You found a metal detector! Keys and coins will be easier to find.'
+
+    def _on_enter_tool(self, cell, effects):
+        # kit_de_crochetage, pelle, marteau : objet permanent trouvé une seule fois
+        tool = effects['type']
+        found_msg, owned_msg = TOOL_MESSAGES[tool]
+        if not self.inventory.objets_permanents.get(tool,False):
+            self.inventory.ajouter_perm(tool)
+            self.turn_msg = found_msg
+        else:
+            self.turn_msg = owned_msg
+
+    def _on_enter_shop(self, cell, effects):
+        self.turn_msg='You entered the shop. Press E to trade.'
+        self.in_shop=True
+        self.shop_active=False
+        self.shop_index=0
 
     def confirm_selection(self):
         """Confirme la pièce choisie, la pose et gère les effets associés."""
+        self.dirty = True
+        self.state_dirty = True
         # 1) sécurité : on vérifie qu'on est bien en mode sélection
         if not self.selection_mode or not self.target_cell:
             return
@@ -1367,17 +1589,15 @@ class Game:
         choice = self.candidates[index]
         tr, tc = self.target_cell
 
-        # 3) direction depuis le joueur vers la nouvelle case
-        dr = tr - self.player_r
-        dc = tc - self.player_c
-        dir_map = {(-1, 0): 'up', (1, 0): 'down', (0, -1): 'left', (0, 1): 'right'}
-        direction = dir_map.get((dr, dc))
+        # 3) direction depuis le joueur vers la nouvelle case (mémorisée à l'ouverture)
+        direction = self.target_dir
 
         # 4) trouver une rotation valide pour cette pièce
         chosen_rot = None
         if direction is not None:
-            for rot in range(4):
-                ports = self.piece_ports_with_rotation(choice, rot)
+            # rotations distinctes précalculées sur la pièce (la plus petite
+            # rotation de chaque masque, donc même choix qu'en testant les 4)
+            for rot, ports in choice.rot_distinct:
                 if self.can_place_with_ports(ports, tr, tc, direction):
                     chosen_rot = rot
                     break
@@ -1389,31 +1609,34 @@ class Game:
 
         # 5) payer le coût en gemmes si besoin
         if choice.cout > 0:
-            if self.inventory.objets_consommables.get('gemmes', 0) < choice.cout:
+            if self.inventory.objets_consommables['gemmes'] < choice.cout:
                 self.turn_msg = "Not enough gems to choose that room."
                 return
             else:
                 self.inventory.retirer('gemmes', choice.cout)
 
         # 6) poser la pièce dans la grille avec la bonne rotation
-        cell = self.grid[tr][tc]
-        cell.piece = choice
-        cell.rotation = chosen_rot
+        cell = self.grid[tr*COLS + tc]
+        self.place_piece(tr, tc, choice, chosen_rot)
 
         # 7) calculer le verrou de la porte
         lock_level = self.door_lock_for_target_row(tr)
 
         # mettre à jour les portes dans les deux sens
-        cur = self.grid[self.player_r][self.player_c]
+        cur = self.grid[self.player_r*COLS + self.player_c]
         if direction:
-            cur.doors[direction] = lock_level
-            cell.doors[self.opposite(direction)] = lock_level
+            i = DIR_IDX[direction]
+            cur.doors = with_door(cur.doors, i, lock_level)
+            cell.doors = with_door(cell.doors, DIR_OPP[i], lock_level)
+        self.mark_dirty(self.player_r, self.player_c)
+        self.mark_dirty(tr, tc)
 
         # 8) retirer UNE occurrence de cette pièce du deck
-        try:
-            self.deck.remove(choice)
-        except ValueError:
-            pass
+        if self.deck[choice] > 0:
+            self.deck[choice] -= 1
+            if not self.deck[choice]:
+                del self.deck[choice]   # plus d'exemplaire : la pièce ne sort plus
+            self._deck_version += 1
 
         # 9) appliquer l'effet "on_draw" éventuel
         od = choice.obj.get('on_draw') if choice.obj else None
@@ -1423,17 +1646,15 @@ class Game:
                 self.inventory.ajouter_conso('gemmes', 1)
                 self.turn_msg = "You drew a room and found a gem!"
             elif typ == 'inc_green_weight':
-                greens = [p for p in ROOM_CATALOG if p.couleur == 'green']
-                if greens:
-                    self.deck.extend(random.choices(greens, k=2))
+                if GREEN_ROOMS:
+                    self._deck_add_random(GREEN_ROOMS, 2)
                     self.turn_msg = "This veranda increases green rooms in the deck."
             elif typ == 'inc_find_objects':
                 self.inventory.ajouter_perm('patte_de_lapin')
                 self.turn_msg = "You found something increasing find chances (patte_de_lapin)."
             elif typ == 'inc_fire_weight':
-                fires = [p for p in ROOM_CATALOG if p.nom == 'Furnace']
-                if fires:
-                    self.deck.extend(random.choices(fires, k=2))
+                if FURNACE_ROOMS:
+                    self._deck_add_random(FURNACE_ROOMS, 2)
                     self.turn_msg = "Furnace makes furnace-like rooms more common in the deck."
         else:
             self.turn_msg = f"Placed {choice.nom} at row {tr}, lock={lock_level}"
@@ -1443,18 +1664,33 @@ class Game:
         self.candidates = []
         self.selection_pos = 0
         self.target_cell = None
+        self.target_dir = None
 
         # 11) enfin, essayer d'entrer dans la nouvelle salle
         if direction:
             self.open_door_or_move(direction)
 
+    def _deck_add_random(self, pool, k):
+        """Ajoute à la pioche `k` exemplaires tirés uniformément (avec remise) dans `pool`.
+
+        Incrémente le Counter sur place, sans liste intermédiaire ; le tirage est
+        celui de `random.choices(pool, k=k)` (un random() par exemplaire).
+        """
+        deck = self.deck
+        n = len(pool)
+        for _ in range(k):
+            deck[pool[int(_random() * n)]] += 1
+        self._deck_version += 1
+
     def redraw_candidates_spend_die(self):
         """Repioche des pièces candidates en dépensant un dé.
 
         Respecte les contraintes de placement (ports + bords) et,
         si possible, assure au moins une option à coût 0.
         """
-        if self.inventory.objets_consommables.get('des', 0) <= 0:
+        self.dirty = True
+        self.state_dirty = True
+        if self.inventory.objets_consommables['des'] <= 0:
             self.turn_msg = "No dice to spend."
             return
         if not self.selection_mode or not self.target_cell:
@@ -1464,11 +1700,7 @@ class Game:
         self.inventory.retirer('des', 1)
 
         tr, tc = self.target_cell
-        # recalculer la direction depuis le joueur vers la case cible
-        dr = tr - self.player_r
-        dc = tc - self.player_c
-        dir_map = {(-1, 0): 'up', (1, 0): 'down', (0, -1): 'left', (0, 1): 'right'}
-        direction = dir_map.get((dr, dc))
+        direction = self.target_dir
 
         candidates = self.generate_candidates(tr, tc, direction)
         if not candidates:
@@ -1489,45 +1721,86 @@ class Game:
 
         Returns:
             True s’il existe un coup légal ; False sinon.
+
+        Le résultat est mémorisé tant que la position, la pioche, le plateau,
+        les portes de la salle courante et les ressources utiles sont inchangés.
         """
-        gems = self.inventory.objets_consommables.get('gemmes', 0)
-        keys = self.inventory.objets_consommables.get('cles', 0)
+        gems = self.inventory.objets_consommables['gemmes']
+        keys = self.inventory.objets_consommables['cles']
         has_kit = self.inventory.objets_permanents.get('kit_de_crochetage', False)
 
-        for d,(dr,dc) in DIRS.items():
-            tr, tc = self.player_r + dr, self.player_c + dc
-            if not self.in_bounds(tr, tc):
+        key = (self.player_r, self.player_c, self._deck_version, self._grid_version,
+               gems, keys, has_kit,
+               self.grid[self.player_r*COLS + self.player_c].doors)
+        if key != self._legal_moves_key:
+            self._legal_moves_key = key
+            self._legal_moves_value = self._compute_legal_moves(gems, keys, has_kit)
+        return self._legal_moves_value
+
+    def _compute_legal_moves(self, gems, keys, has_kit):
+        """Parcours effectif des coups légaux (voir `has_legal_moves`)."""
+        # niveau de verrou le plus élevé qu'on sait ouvrir : une clé ouvre tout,
+        # le kit seulement le niveau 1
+        max_lock = 2 if keys > 0 else 1 if has_kit else 0
+        cur_doors = self.grid[self.player_r*COLS + self.player_c].doors
+        # rotations atteignables par les pièces abordables, calculées une fois pour les 4 directions
+        reach = None
+        for i, d in enumerate(DIR_ORDER):
+            tr, tc = self.player_r + DIR_DR[i], self.player_c + DIR_DC[i]
+            if not (0 <= tr < ROWS and 0 <= tc < COLS):
                 continue
-            cell = self.grid[tr][tc]
+            cell = self.grid[tr*COLS + tc]
 
             # a) mouvement vers une piece, est ce que je peut ouvrir la porte?
             if cell.piece is not None:
-                cur_cell = self.grid[self.player_r][self.player_c]
                 #convention : verrou côté salle actuelle
-                lock = cur_cell.doors.get(d)
-                lock = 0 if lock is None else lock
-                if lock == 0:
-                    return True
-                if lock == 1 and (has_kit or keys > 0):
-                    return True
-                if lock == 2 and keys > 0:
+                lock = door_level(cur_doors, i)
+                if lock is None or lock <= max_lock:
                     return True
 
             # b) Aménagement d'une nouvelle salle : existe-t-il une pièce valable/abordable ?
             else:
-                
-                for p in self.deck:
-                    if p.cond_deplac == 'edge' and (tr not in (0, ROWS-1) and tc not in (0, COLS-1)):
-                        continue
-                    if not self.can_place_piece(p, tr, tc, d):
-                        continue
-                    if p.cout == 0 or p.cout <= gems:
-                        return True
+                if reach is None:
+                    reach = self._affordable_reach(gems)
+                on_edge = tr in (0, ROWS-1) or tc in (0, COLS-1)
+                # une pièce convient ssi ses rot_bits croisent les masques acceptables :
+                # il suffit donc de tester l'union des rot_bits du bon groupe
+                if reach[0 if on_edge else 1] & self._fitting_masks(tr, tc, d):
+                    return True
 
         return False
+
+    def _affordable_reach(self, gems):
+        """Union des `rot_bits` des pièces abordables de la pioche, par groupe.
+
+        Returns:
+            tuple[int, int]: (toutes les pièces abordables, celles sans contrainte 'edge').
+
+        Mémorisé tant que la pioche et le nombre de gemmes sont inchangés.
+        """
+        key = (self._deck_version, gems)
+        if key != self._reach_key:
+            edge_bits = inner_bits = 0
+            for p in self.deck:
+                if p.cout == 0 or p.cout <= gems:
+                    edge_bits |= p.rot_bits
+                    if p.cond_deplac != 'edge':
+                        inner_bits |= p.rot_bits
+            self._reach_key = key
+            self._reach = (edge_bits, inner_bits)
+        return self._reach
     
+    def move_selection(self, delta):
+        """Déplace la sélection parmi les pièces candidates (sans boucler)."""
+        self.dirty = True
+        if delta < 0:
+            self.selection_pos = max(0, self.selection_pos+delta)
+        else:
+            self.selection_pos = min(len(self.candidates)-1, self.selection_pos+delta)
+
     def shop_move_selection(self, delta):
         """Déplace la sélection dans le menu de shop."""
+        self.dirty = True
         if not (self.in_shop and self.shop_active):
             return
         n = len(SHOP_ITEMS)
@@ -1542,13 +1815,15 @@ class Game:
 
     def shop_buy_current(self):
         """Achète l’objet actuellement sélectionné dans le shop."""
+        self.dirty = True
+        self.state_dirty = True
         if not (self.in_shop and self.shop_active):
             self.turn_msg = "You are not in a shop."
             return
 
         item = SHOP_ITEMS[self.shop_index]
         cost = item["cost"]
-        coins = self.inventory.objets_consommables.get("pieces", 0)
+        coins = self.inventory.objets_consommables["pieces"]
 
         if coins < cost:
             self.turn_msg = (
@@ -1571,6 +1846,42 @@ class Game:
         self.turn_msg = f"Bought {item['label']} for {cost} coins. Gained {gained}."
 
 
+# messages (trouvé, déjà possédé) des objets permanents ramassés en entrant
+TOOL_MESSAGES = {
+    'kit_de_crochetage': ('You found a kit de crochetage! Level-1 doors can be opened for free.',
+                          'You already have a kit de crochetage.'),
+    'pelle': ('You found a shovel! You can now dig at dig sites.', 'You already have a shovel.'),
+    'marteau': ('You found a hammer! You can now break chests.', 'You already have a hammer.'),
+}
+
+# trouvailles aléatoires en entrant dans une salle : (consommable, quantité, message)
+FIND_TABLE = {
+    'gemmes': ('gemmes', 1, " Found 1 gem."),
+    'cles': ('cles', 1, " Found 1 key."),
+    'des': ('des', 1, " Found 1 die."),
+    'pieces': ('pieces', 5, " Found some coins."),
+    'pas': ('pas', 3, " Found 3 steps."),
+}
+FIND_POOL = tuple(FIND_TABLE[k] for k in ('gemmes', 'cles', 'des', 'pieces', 'pas'))
+# higher probability of finding keys and pieces
+FIND_POOL_DETECTOR = tuple(FIND_TABLE[k] for k in
+                           ('gemmes', 'cles', 'cles', 'pieces', 'pieces', 'des', 'pas'))
+
+# type d'effet 'on_enter' -> handler de Game (dispatch O(1) au lieu d'une chaîne if/elif)
+ON_ENTER_HANDLERS = {
+    'coins': Game._on_enter_coins,
+    'food': Game._on_enter_food,
+    'goal': Game._on_enter_goal,
+    'start': Game._on_enter_start,
+    'spawn': Game._on_enter_spawn,
+    'detecteur_de_metaux': Game._on_enter_detector,
+    'kit_de_crochetage': Game._on_enter_tool,
+    'pelle': Game._on_enter_tool,
+    'marteau': Game._on_enter_tool,
+    'shop': Game._on_enter_shop,
+}
+
+
 # -------------------------
 # Pygame rendering
 # -------------------------
@@ -1580,12 +1891,19 @@ pygame.font.init()
 def load_item_image(name, size=(24, 24)):
     """Charge une icône d'objet depuis le dossier items."""
     path = os.path.join("projet-jeu-python-main/model/items", name)
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.smoothscale(img, size)
-        return img
-    except Exception:
-        return None
+    return _load_scaled(path, tuple(size))
+
+def load_item_image_gray(name, size=(24, 24)):
+    """Icône d'objet assombrie (objet permanent non possédé), mise en cache."""
+    path = os.path.join("projet-jeu-python-main/model/items", name)
+    key = (path, tuple(size), 'gray')
+    if key not in _IMG_CACHE:
+        img = load_item_image(name, size)
+        if img:
+            img = img.copy()
+            img.fill((80, 80, 80), None, pygame.BLEND_RGBA_MULT)
+        _IMG_CACHE[key] = img
+    return _IMG_CACHE[key]
     
 # try emoji font first, fallback to Arial
 try:
@@ -1596,6 +1914,248 @@ except:
     except:
         EMOJI_FONT = pygame.font.SysFont("Arial", 18)
 
+# rendus de texte déjà rasterisés (noms de pièces, coûts, libellés...),
+# clé (police, texte, couleur) ; vidé s'il grossit trop
+_TEXT_CACHE = {}
+_TEXT_CACHE_MAX = 512
+
+# barre de jauge des consommables : une seule surface, on en blitte une portion
+BAR_MAX = 120
+_BAR = pygame.Surface((BAR_MAX, 6))
+_BAR.fill((80, 80, 150))
+
+def _render(font, text, color):
+    """Retourne `font.render(text, True, color)`, mis en cache."""
+    key = (font, text, color)
+    s = _TEXT_CACHE.get(key)
+    if s is None:
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_MAX:
+            _TEXT_CACHE.clear()
+        s = font.render(text, True, color)
+        _TEXT_CACHE[key] = s
+    return s
+
+def emoji_surface(e):
+    """Retourne le rendu (mis en cache) d'un emoji de badge."""
+    return _render(EMOJI_FONT, e, (255, 255, 255))
+
+def name_surface(nom):
+    """Retourne le rendu (mis en cache) du nom abrégé d'une pièce."""
+    return _render(FONT, nom[:10], (255,255,255))
+
+# couleur des placeholders quand l'image d'une pièce manque
+ROOM_COLORS = {'green':(60,130,60),'purple':(110,60,110),'orange':(200,120,60),'blue':(60,90,160),'yellow': (190,170,60),
+    'red':    (180,60,60),}
+
+# pastille de porte par niveau de verrou : 0 gris (ouvert), 1 orange, 2 rouge
+LEVEL_COLORS = ((150,150,150), (200,120,60), (200,60,60))
+
+# icône de chaque consommable / objet permanent (dossier items)
+CONSO_ICONS = {
+    "pas": "steps.png",
+    "pieces": "coin.png",
+    "gemmes": "gems.png",
+    "cles": "key.png",
+    "des": "die.png",
+}
+PERM_ICONS = {
+    "pelle": "shovel.png",
+    "marteau": "hammer.png",
+    "kit_de_crochetage": "lockpick.png",
+    "detecteur_de_metaux": "detector.png",
+    "patte_de_lapin": "rabbitfoot.png",
+}
+
+# position du plateau à l'écran et rectangles des cases, calculés une seule fois :
+# CELL_RECTS en coordonnées de `Game.grid_surface`, PLAYER_RECTS en coordonnées écran
+GRID_ORIGIN = (20, 20)
+CELL_RECTS = [[pygame.Rect(c*CELL_W+MARGIN, r*CELL_H+MARGIN, CELL_W-2*MARGIN, CELL_H-2*MARGIN)
+               for c in range(COLS)] for r in range(ROWS)]
+PLAYER_RECTS = [[rect.move(GRID_ORIGIN) for rect in row] for row in CELL_RECTS]
+
+def _door_points(rect):
+    """Centres des pastilles de porte d'une case, dans l'ordre de DIR_ORDER."""
+    return ((rect.centerx, rect.top+3),     # up
+            (rect.right-6, rect.centery),   # right
+            (rect.centerx, rect.bottom-6),  # down
+            (rect.left+3, rect.centery))    # left
+
+# DOOR_POINTS[r][c][DIR_IDX[d]] : position de la pastille de la porte d de la case (r, c)
+DOOR_POINTS = [[_door_points(rect) for rect in row] for row in CELL_RECTS]
+
+# géométrie du panneau de sélection (ne dépend que de la taille de fenêtre)
+SEL_W, SEL_H = 620, 230
+SEL_POS = ((WINDOW_W - SEL_W) // 2, (WINDOW_H - SEL_H) // 2)
+CARD_W = (SEL_W - 60) // 3  # 3 cartes + marges
+CARD_H = SEL_H - 80
+CARD_RECTS = tuple(pygame.Rect(SEL_POS[0] + 20 + i * (CARD_W + 10), SEL_POS[1] + 45, CARD_W, CARD_H)
+                   for i in range(3))
+
+def _draw_cell(surface, cell, r, c):
+    """Dessine la case (r, c) (fond, pièce, badge d'interactif, portes) sur `surface`."""
+    # on efface toute la case : l'ancien contenu de la surface en cache reste sinon visible
+    pygame.draw.rect(surface, (30,30,30), (c*CELL_W, r*CELL_H, CELL_W, CELL_H))
+    rect = CELL_RECTS[r][c]
+    # background
+    pygame.draw.rect(surface, (60,60,60), rect)
+    # if piece, draw image or box and name
+    if cell.piece:
+        # image déjà tournée, mise en cache par (image, taille, rotation)
+        img_rot = load_image_rotated(cell.piece.image_id, cell.rotation)
+        if img_rot:
+            # recentrer (la taille peut changer)
+            img_rect = img_rot.get_rect(center=rect.center)
+            surface.blit(img_rot, img_rect.topleft)
+        else:
+            # colored placeholder based on piece color
+            clr = ROOM_COLORS.get(cell.piece.couleur,(120,120,120))
+            pygame.draw.rect(surface, clr, rect)
+            txt = name_surface(cell.piece.nom)
+            surface.blit(txt, (rect.x+4, rect.y+4))
+    else:
+        # unexplored
+        pygame.draw.rect(surface, (20,20,20), rect)
+    # interactable indicator (chest, casier or dig site)
+    # Cell.interactable vaut None ou un Interactable : pas besoin d'isinstance
+    it = cell.interactable
+    if it is not None and not it.opened:
+        emoji = it.emoji()
+        badge = emoji_surface(emoji)
+        surface.blit(badge, (rect.right - 24, rect.top))
+
+
+    # draw door lock marker (if doors set)
+    doors = cell.doors
+    if doors:
+        door_points = DOOR_POINTS[r][c]
+        for i in range(4):
+            lv = door_level(doors, i)
+            if lv is not None:
+                # small colored dot near side with number
+                pygame.draw.circle(surface, LEVEL_COLORS[lv], door_points[i], 6)
+
+# voile semi-transparent du mode sélection, créé au premier usage :
+# convert_alpha() exige que la fenêtre (set_mode) existe déjà
+_DARKEN = None
+
+def _darken_surface():
+    """Retourne le voile plein écran qui assombrit le plateau en mode sélection."""
+    global _DARKEN
+    if _DARKEN is None:
+        s = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
+        s.fill((0, 0, 0, 150))
+        _DARKEN = s.convert_alpha()
+    return _DARKEN
+
+# cadre du panneau de sélection (fond, bandeau, consigne), composé au premier usage
+_SEL_PANEL = None
+
+def _selection_panel_surface():
+    """Retourne le cadre fixe du panneau central du mode sélection."""
+    global _SEL_PANEL
+    if _SEL_PANEL is None:
+        s = pygame.Surface((SEL_W, SEL_H), pygame.SRCALPHA)
+        pygame.draw.rect(s, (50, 50, 60), (0, 0, SEL_W, SEL_H), border_radius=10)
+        pygame.draw.rect(s, (200, 200, 220), (0, 0, SEL_W, 30), border_radius=10)
+        s.blit(_render(BIG, "Choose a room (ENTER) or R to redraw (spend die)", (0, 0, 0)), (8, 4))
+        _SEL_PANEL = s
+    return _SEL_PANEL
+
+# cartes de candidates déjà composées (fond, vignette, nom, coût/rareté),
+# clé (pièce, largeur, hauteur) : une carte ne dépend que de la pièce
+_CARD_CACHE = {}
+
+def _card_surface(cand, card_w, card_h):
+    """Retourne la carte de sélection d'une pièce candidate, mise en cache."""
+    key = (cand, card_w, card_h)
+    card = _CARD_CACHE.get(key)
+    if card is not None:
+        return card
+    card = pygame.Surface((card_w, card_h), pygame.SRCALPHA)
+    crect = card.get_rect()
+    pygame.draw.rect(card, (80, 80, 90), crect, border_radius=8)
+
+    #vignette carrée propre
+    thumb_size = min(card_w - 20, card_h - 70)  # laisse de la place pour le texte
+    img = load_image(cand.image_id, size=(thumb_size, thumb_size))
+    if img:
+        img_rect = img.get_rect()
+        img_rect.centerx = crect.centerx
+        img_rect.top = crect.top + 8
+        card.blit(img, img_rect.topleft)
+    else:
+        # placeholder carré
+        placeholder = pygame.Rect(0, 0, thumb_size, thumb_size)
+        placeholder.centerx = crect.centerx
+        placeholder.top = crect.top + 8
+        pygame.draw.rect(card, (100, 100, 120), placeholder)
+
+    display_name = cand.nom if len(cand.nom) <= 18 else cand.nom[:17] + "…"
+    text_y = crect.bottom - 40
+    card.blit(_render(FONT, display_name, (255, 255, 255)), (crect.x + 6, text_y))
+    info_surf = _render(
+        FONT, f"Cost: {cand.cout}   Rarity: {cand.degre_rarete}", (210, 210, 210)
+    )
+    card.blit(info_surf, (crect.x + 6, text_y + 18))
+    _CARD_CACHE[key] = card
+    return card
+
+def _consumables_surface(inv, width):
+    """Compose la section « Consumables » du panneau (titre, icônes, jauges, quantités)."""
+    rows = inv.vue_consommables()
+    surf = pygame.Surface((width, 22 + 30*len(rows)))
+    surf.fill((25, 25, 25))  # couleur du fond du panneau sous la section
+    blits = [(_render(EMOJI_FONT, "Consumables", (210, 210, 255)), (0, 0))]
+    y = 22
+    for k, v, label in rows:
+        icon_name = CONSO_ICONS.get(k)
+
+        text_x = 5
+
+        if icon_name:
+            img = load_item_image(icon_name, size=(24, 24))
+            if img:
+                blits.append((img, (5, y)))
+                text_x = 5 + 24 + 6  # texte à droite de l’icône
+
+        bar_len = min(BAR_MAX, v * 2)
+        if bar_len > 0:
+            blits.append((_BAR, (130, y + 5), (0, 0, bar_len, 6)))
+
+        blits.append((_render(FONT, label, (230, 230, 230)), (text_x, y)))
+
+        y += 30
+    surf.blits(blits, doreturn=0)
+    return surf
+
+def _permanents_surface(inv, width):
+    """Compose la section « Permanents » du panneau (titre, icônes, noms grisés si absents)."""
+    rows = inv.vue_permanents()
+    surf = pygame.Surface((width, 22 + 26*len(rows)))
+    surf.fill((25, 25, 25))  # couleur du fond du panneau sous la section
+    blits = [(_render(EMOJI_FONT, "Permanents", (210, 210, 255)), (0, 0))]
+    y = 22
+    for k, v in rows:
+        icon_name = PERM_ICONS.get(k)
+
+        text_x = 5
+
+        if icon_name:
+            if v:
+                img = load_item_image(icon_name, size=(24, 24))
+            else:
+                img = load_item_image_gray(icon_name, size=(24, 24))
+            if img:
+                blits.append((img, (5, y)))
+                text_x = 5 + 24 + 6
+
+        color = (230, 255, 230) if v else (140, 140, 140)
+        blits.append((_render(FONT, f"{k}", color), (text_x, y)))
+
+        y += 26
+    surf.blits(blits, doreturn=0)
+    return surf
+
 def draw_game(screen, game):
     """Rend l’état courant du jeu sur l’écran Pygame.
 
@@ -1623,224 +2183,105 @@ def draw_game(screen, game):
             0 → gris (ouvert), 1 → orange (verrou faible), 2 → rouge (verrou fort).
         - Les objets interactifs non ouverts affichent un petit emoji dans le coin
           supérieur droit de la cellule.
+        - Le plateau est rendu dans `game.grid_surface` : seules les cases de
+          `game.dirty_cells` sont repeintes, puis le contour du joueur est
+          dessiné par-dessus.
         - En mode sélection, une couche semi-transparente et un panneau central
           listent jusqu’à trois candidats avec coût/rareté, et encadrent l’option
           courante.
         """
     screen.fill((30,30,30))
-    # grid
-    ox = 20
-    oy = 20
-    for r in range(ROWS):
-        for c in range(COLS):
-            x = ox + c*CELL_W
-            y = oy + r*CELL_H
-            cell = game.grid[r][c]
-            rect = pygame.Rect(x+MARGIN, y+MARGIN, CELL_W-2*MARGIN, CELL_H-2*MARGIN)
-            # background
-            pygame.draw.rect(screen, (60,60,60), rect)
-            # if piece, draw image or box and name
-            if cell.piece:
-                img = load_image(cell.piece.image_id)
-                if img:
-                    # rotation en degrés dans le sens horaire -> Pygame tourne dans le sens anti-horaire
-                    angle = -90 * cell.rotation   # 0, -90, -180, -270
-                    img_rot = pygame.transform.rotate(img, angle)
-                    # recentrer (la taille peut changer)
-                    img_rect = img_rot.get_rect(center=rect.center)
-                    screen.blit(img_rot, img_rect.topleft)
-                else:
-                    # colored placeholder based on piece color
-                    clr = {'green':(60,130,60),'purple':(110,60,110),'orange':(200,120,60),'blue':(60,90,160),'yellow': (190,170,60),
-    'red':    (180,60,60),}.get(cell.piece.couleur,(120,120,120))
-                    pygame.draw.rect(screen, clr, rect)
-                    txt = FONT.render(cell.piece.nom[:10], True, (255,255,255))
-                    screen.blit(txt, (rect.x+4, rect.y+4))
-            else:
-                # unexplored
-                pygame.draw.rect(screen, (20,20,20), rect)
-            # draw player
-            if (r,c)==(game.player_r, game.player_c):
-                pygame.draw.rect(screen, (255,255,0), rect, 3)
-
-            # interactable indicator (chest, casier or dig site)
-            if isinstance(cell.interactable, Interactable) and not cell.interactable.opened:
-                emoji = cell.interactable.emoji()
-                badge = EMOJI_FONT.render(emoji, True, (255, 255, 255))
-                screen.blit(badge, (rect.right - 24, rect.top))
-
-
-            # draw door lock marker (if doors set)
-            cell_doors = cell.doors
-            for i,dir in enumerate(['up','left','right','down']):
-                lv = cell_doors.get(dir)
-                if lv is not None:
-                    # small colored dot near side with number
-                    if dir=='up':
-                        px,py = rect.centerx, rect.top+3
-                    elif dir=='down':
-                        px,py = rect.centerx, rect.bottom-6
-                    elif dir=='left':
-                        px,py = rect.left+3, rect.centery
-                    else:
-                        px,py = rect.right-6, rect.centery
-                    color = (150,150,150) if lv==0 else (200,120,60) if lv==1 else (200,60,60)
-                    pygame.draw.circle(screen, color, (px,py), 6)
+    # grid : seules les cases marquées sales sont repeintes sur la surface en cache
+    grid_surface = game.grid_surface
+    if grid_surface is None:
+        # convert() (format de l'écran, blit le plus rapide) exige une fenêtre ouverte
+        grid_surface = game.grid_surface = pygame.Surface((COLS*CELL_W, ROWS*CELL_H)).convert()
+        game.dirty_all = True
+    if game.dirty_all:
+        grid_surface.fill((30,30,30))
+        dirty = [(r, c) for r in range(ROWS) for c in range(COLS)]
+        game.dirty_all = False
+    else:
+        dirty = game.dirty_cells
+    for r, c in dirty:
+        _draw_cell(grid_surface, game.grid[r*COLS + c], r, c)
+    game.dirty_cells = set()
+    screen.blit(grid_surface, GRID_ORIGIN)
+    # draw player (par-dessus le plateau en cache)
+    pygame.draw.rect(screen, (255,255,0), PLAYER_RECTS[game.player_r][game.player_c], 3)
     panel_x = COLS*CELL_W + 40
-    pygame.draw.rect(
-        screen,
-        (25, 25, 25),
-        (panel_x - 15, 10, WINDOW_W - panel_x - 25, WINDOW_H - 20),
-        border_radius=10,
-    )
-    pygame.draw.rect(
-        screen,
-        (60, 60, 70),
-        (panel_x - 15, 10, WINDOW_W - panel_x - 25, 40),
-        border_radius=10,
-    )
-    screen.blit(EMOJI_FONT.render("Inventory", True, (255, 255, 255)), (panel_x, 18))
+    # fond du panneau et titre « Inventory » (invariants) : rasterisés une seule fois puis blittés
+    if game._panel_bg is None:
+        panel_w = WINDOW_W - panel_x - 25
+        panel_bg = pygame.Surface((panel_w, WINDOW_H - 20), pygame.SRCALPHA)
+        pygame.draw.rect(panel_bg, (25, 25, 25), (0, 0, panel_w, WINDOW_H - 20), border_radius=10)
+        pygame.draw.rect(panel_bg, (60, 60, 70), (0, 0, panel_w, 40), border_radius=10)
+        panel_bg.blit(_render(EMOJI_FONT, "Inventory", (255, 255, 255)), (15, 8))
+        game._panel_bg = panel_bg
+    screen.blit(game._panel_bg, (panel_x - 15, 10))
+    # textes et icônes du panneau : envoyés en un seul appel screen.blits
+    panel_blits = []
 
     inv = game.inventory
 
     # --- Consumables ---
+    # section composée hors écran, refaite seulement si `inv.version` a changé
     y = 60
-    screen.blit(EMOJI_FONT.render("Consumables", True, (210, 210, 255)), (panel_x, y))
-
-    y += 22
-    for k, v in inv.objets_consommables.items():
-        icon_name = {
-            "pas": "steps.png",
-            "pieces": "coin.png",
-            "gemmes": "gems.png",
-            "cles": "key.png",
-            "des": "die.png",
-        }.get(k, None)
-
-        text_x = panel_x + 5
-
-        if icon_name:
-            img = load_item_image(icon_name, size=(24, 24))
-            if img:
-                screen.blit(img, (panel_x + 5, y))
-                text_x = panel_x + 5 + 24 + 6  # texte à droite de l’icône
-
-        bar_len = min(120, v * 2)
-        pygame.draw.rect(screen, (80, 80, 150), (panel_x + 130, y + 5, bar_len, 6))
-
-        txt = FONT.render(f"{k} : {v}", True, (230, 230, 230))
-        screen.blit(txt, (text_x, y))
-
-        y += 30
+    if game._conso_version != inv.version:
+        game._conso_surf = _consumables_surface(inv, WINDOW_W - 40 - panel_x)
+        game._conso_version = inv.version
+    panel_blits.append((game._conso_surf, (panel_x, y)))
+    y += game._conso_surf.get_height()
 
     # --- Permanents ---
+    # même principe que les consommables : section refaite seulement si l'inventaire change
     y += 8
-    screen.blit(EMOJI_FONT.render("Permanents", True, (210, 210, 255)), (panel_x, y))
-
-    y += 22
-    for k, v in inv.objets_permanents.items():
-        icon_name = {
-            "pelle": "shovel.png",
-            "marteau": "hammer.png",
-            "kit_de_crochetage": "lockpick.png",
-            "detecteur_de_metaux": "detector.png",
-            "patte_de_lapin": "rabbitfoot.png",
-        }.get(k, None)
-
-        text_x = panel_x + 5
-
-        if icon_name:
-            img = load_item_image(icon_name, size=(24, 24))
-            if img:
-                if not v:
-                    gray = img.copy()
-                    gray.fill((80, 80, 80), None, pygame.BLEND_RGBA_MULT)
-                    img = gray
-                screen.blit(img, (panel_x + 5, y))
-                text_x = panel_x + 5 + 24 + 6
-
-        color = (230, 255, 230) if v else (140, 140, 140)
-        txt = FONT.render(f"{k}", True, color)
-        screen.blit(txt, (text_x, y))
-
-        y += 26 
+    if game._perm_version != inv.version:
+        game._perm_surf = _permanents_surface(inv, WINDOW_W - 40 - panel_x)
+        game._perm_version = inv.version
+    panel_blits.append((game._perm_surf, (panel_x, y)))
+    y += game._perm_surf.get_height()
 
     #Shop panel
     if game.in_shop:
         y += 10
         title = "🏬 Shop (press E)" if not game.shop_active else "🏬 Shop (←/→, ENTER, E)"
-        screen.blit(EMOJI_FONT.render(title, True, (210,210,255)), (panel_x, y))
+        panel_blits.append((_render(EMOJI_FONT, title, (210,210,255)), (panel_x, y)))
         y += 22
 
         for i, item in enumerate(SHOP_ITEMS):
             selected = (i == game.shop_index and game.shop_active)
             prefix = "> " if selected else "  "
             color = (255,255,0) if selected else (220,220,220)
-            txt = FONT.render(
+            txt = _render(
+                FONT,
                 f"{prefix}{item['label']}  [{item['cost']} coins]",
-                True,
                 color
             )
-            screen.blit(txt, (panel_x+5, y))
+            panel_blits.append((txt, (panel_x+5, y)))
             y += 18
 
 
-    # bottom message
-    msgsurf = FONT.render("Msg: " + game.turn_msg, True, (240,240,240))
-    screen.blit(msgsurf, (panel_x, WINDOW_H - 40))
-    
+    # bottom message : rendu gardé sur `game` tant que le message ne change pas ;
+    # il ne passe pas par _TEXT_CACHE, que des messages tous différents videraient
+    if game._msg_text != game.turn_msg:
+        game._msg_surf = FONT.render("Msg: " + game.turn_msg, True, (240,240,240))
+        game._msg_text = game.turn_msg
+    panel_blits.append((game._msg_surf, (panel_x, WINDOW_H - 40)))
+    screen.blits(panel_blits, doreturn=0)
+
     # selection mode overlay
     if game.selection_mode:
         # fond assombri
-        s = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 150))
-        screen.blit(s, (0, 0))
-
-        # panneau central
-        w = 620
-        h = 230
-        px = (WINDOW_W - w) // 2
-        py = (WINDOW_H - h) // 2
-        pygame.draw.rect(screen, (50, 50, 60), (px, py, w, h), border_radius=10)
-        pygame.draw.rect(screen, (200, 200, 220), (px, py, w, 30), border_radius=10)
-        screen.blit(
-            BIG.render("Choose a room (ENTER) or R to redraw (spend die)", True, (0, 0, 0)),
-            (px + 8, py + 4)
-        )
+        screen.blit(_darken_surface(), (0, 0))
 
-        # cartes de rooms
-        cx = px + 20
-        cy = py + 45
-        card_w = (w - 60) // 3 # 3 cartes + marges
-        card_h = h - 80
+        # panneau central : fond, bandeau et consigne identiques à chaque image, blittés d'un bloc
+        screen.blit(_selection_panel_surface(), SEL_POS)
 
+        # cartes de rooms, aux emplacements précalculés (CARD_RECTS)
         for i, cand in enumerate(game.candidates):
-            crect = pygame.Rect(cx + i * (card_w + 10), cy, card_w, card_h)
-            pygame.draw.rect(screen, (80, 80, 90), crect, border_radius=8)
-
-            #vignette carrée propre
-            thumb_size = min(card_w - 20, card_h - 70)  # laisse de la place pour le texte
-            img = load_image(cand.image_id, size=(thumb_size, thumb_size))
-            if img:
-                img_rect = img.get_rect()
-                img_rect.centerx = crect.centerx
-                img_rect.top = crect.top + 8
-                screen.blit(img, img_rect.topleft)
-            else:
-                # placeholder carré
-                placeholder = pygame.Rect(0, 0, thumb_size, thumb_size)
-                placeholder.centerx = crect.centerx
-                placeholder.top = crect.top + 8
-                pygame.draw.rect(screen, (100, 100, 120), placeholder)
-
-            display_name = cand.nom if len(cand.nom) <= 18 else cand.nom[:17] + "…"
-            text_y = crect.bottom - 40
-            name_surf = FONT.render(display_name, True, (255, 255, 255))
-            screen.blit(name_surf, (crect.x + 6, text_y))
-            info_surf = FONT.render(
-                f"Cost: {cand.cout}   Rarity: {cand.degre_rarete}", True, (210, 210, 210)
-            )
-            screen.blit(info_surf, (crect.x + 6, text_y + 18))
+            crect = CARD_RECTS[i]
+            screen.blit(_card_surface(cand, CARD_W, CARD_H), crect.topleft)
             # surbrillance du sélection
             if i == game.selection_pos:
                 pygame.draw.rect(screen, (255, 255, 0), crect, 3, border_radius=8)
@@ -1853,7 +2294,8 @@ def game_loop():
         relance des candidats, inventaire, sortie avec ESC),
       - met à jour les messages/état de fin (plus de pas, absence de coups légaux),
       - dessine l’interface via `draw_game(...)`,
-      - limite la cadence d’affichage (clock.tick(30)).
+      - attend les événements avec `pygame.event.wait` (500 ms max) plutôt que
+        de cadencer la boucle avec une horloge.
 
     La boucle se termine proprement en cas de fermeture de la fenêtre, pression
     d’ESC, ou quand `game.running` devient False (Game Over / victoire).
@@ -1863,68 +2305,88 @@ def game_loop():
     """
     screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
     pygame.display.set_caption("Blue Prince - simplified")
-    clock = pygame.time.Clock()
     game = Game()
+    # seuls QUIT, KEYDOWN et l'exposition de la fenêtre (qui force un redessin)
+    # sont traités : SDL ne met plus les autres événements (souris...) en file,
+    # la liste reste vide au repos
+    handled_events = (pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(handled_events)
+
+    # tables touche -> action, construites une fois (pas de chaîne if/elif par événement)
+    QUIT, KEYDOWN, NOEVENT = pygame.QUIT, pygame.KEYDOWN, pygame.NOEVENT
+    K_ESCAPE = pygame.K_ESCAPE
+    selection_keys = {
+        pygame.K_RETURN: Game.confirm_selection,
+        pygame.K_r: Game.redraw_candidates_spend_die,
+        pygame.K_LEFT: lambda g: g.move_selection(-1),  # Q key or left arrow
+        pygame.K_q: lambda g: g.move_selection(-1),
+        pygame.K_RIGHT: lambda g: g.move_selection(+1),
+        pygame.K_d: lambda g: g.move_selection(+1),
+    }
+    shop_keys = {
+        pygame.K_LEFT: lambda g: g.shop_move_selection(-1),
+        pygame.K_q: lambda g: g.shop_move_selection(-1),
+        pygame.K_RIGHT: lambda g: g.shop_move_selection(+1),
+        pygame.K_d: lambda g: g.shop_move_selection(+1),
+        pygame.K_RETURN: Game.shop_buy_current,
+        pygame.K_e: Game.interact_current_cell,  # ferme le shop
+    }
+    # movement keys (Z Q S D or arrows) ; I (toggle inventory) : on l'affiche toujours
+    move_keys = {
+        pygame.K_z: 'up', pygame.K_UP: 'up',
+        pygame.K_s: 'down', pygame.K_DOWN: 'down',
+        pygame.K_q: 'left', pygame.K_LEFT: 'left',
+        pygame.K_d: 'right', pygame.K_RIGHT: 'right',
+    }
+    play_keys = {key: (lambda g, d=d: g.open_door_or_move(d)) for key, d in move_keys.items()}
+    play_keys[pygame.K_e] = Game.interact_current_cell
 
     while True:
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
+        # le thread dort dans SDL jusqu'au prochain événement au lieu d'être
+        # cadencé par clock.tick(30) ; rien n'est animé, le délai max peut donc
+        # être long (tout changement d'état passe par un événement)
+        ev = pygame.event.wait(500)
+        events = pygame.event.get(handled_events)
+        if ev.type != NOEVENT:
+            events.insert(0, ev)
+        for ev in events:
+            if ev.type == QUIT:
                 pygame.quit()
                 return
-            if ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_ESCAPE:
+            if ev.type == KEYDOWN:
+                if ev.key == K_ESCAPE:
                     pygame.quit()
                     return
                 if game.selection_mode:
-                    if ev.key == pygame.K_RETURN:
-                        game.confirm_selection()
-                    elif ev.key == pygame.K_r:
-                        game.redraw_candidates_spend_die()
-                    elif ev.key in (pygame.K_LEFT, pygame.K_q):  # Q key or left arrow
-                        game.selection_pos = max(0, game.selection_pos-1)
-                    elif ev.key in (pygame.K_RIGHT, pygame.K_d):
-                        game.selection_pos = min(len(game.candidates)-1, game.selection_pos+1)
-                else:
+                    action = selection_keys.get(ev.key)
+                elif game.shop_active:
                     # Si le menu de shop est ouvert, les touches servent au shop
-                    if game.shop_active:
-                        if ev.key in (pygame.K_LEFT, pygame.K_q):
-                            game.shop_move_selection(-1)
-                        elif ev.key in (pygame.K_RIGHT, pygame.K_d):
-                            game.shop_move_selection(+1)
-                        elif ev.key == pygame.K_RETURN:
-                            game.shop_buy_current()
-                        elif ev.key == pygame.K_e:
-                            game.interact_current_cell()  # ferme le shop
-                        # Les touches de mouvement sont ignorées tant que le shop est ouvert
-                    
-                    else:  
-                        # movement keys (Z Q S D or arrows)
-                        if ev.key in (pygame.K_z, pygame.K_UP):
-                            game.open_door_or_move('up')
-                        elif ev.key in (pygame.K_s, pygame.K_DOWN):
-                            game.open_door_or_move('down')
-                        elif ev.key in (pygame.K_q, pygame.K_LEFT):
-                            game.open_door_or_move('left')
-                        elif ev.key in (pygame.K_d, pygame.K_RIGHT):
-                            game.open_door_or_move('right')
-                        elif ev.key==pygame.K_e:
-                            game.interact_current_cell()
-                        elif ev.key == pygame.K_i:
-                            # toggle inventory? (we always show)
-                            pass
-                    
-        # check lose condition
-        if game.inventory.objets_consommables.get('pas',0) <= 0:
-            game.turn_msg = "You ran out of steps! Game Over."
-            game.running = False
-        elif not game.selection_mode and not game.has_legal_moves():
-            game.turn_msg = "Bloqué – plus de coup légal. Game Over."
-            game.running = False
-
-        # draw
-        draw_game(screen, game)
-        pygame.display.flip()
-        clock.tick(30)
+                    # (les touches de mouvement sont ignorées tant que le shop est ouvert)
+                    action = shop_keys.get(ev.key)
+                else:
+                    action = play_keys.get(ev.key)
+                if action is not None:
+                    action(game)
+            else:
+                game.dirty = True
+
+        # check lose condition (l'état ne change qu'après une action de jeu : inutile
+        # de refaire le test pour un simple déplacement de curseur ou un redessin)
+        if game.state_dirty:
+            game.state_dirty = False
+            if game.inventory.objets_consommables['pas'] <= 0:
+                game.turn_msg = "You ran out of steps! Game Over."
+                game.running = False
+            elif not game.selection_mode and not game.has_legal_moves():
+                game.turn_msg = "Bloqué – plus de coup légal. Game Over."
+                game.running = False
+
+        # draw (seulement si quelque chose a changé depuis la dernière image)
+        if game.dirty:
+            draw_game(screen, game)
+            pygame.display.flip()
+            game.dirty = False
         if not game.running:
             # show message for a moment then quit
             pygame.time.delay(1500)